@@ -1,38 +1,89 @@
 """The eSolat Takwim Malaysia integration."""
 from __future__ import annotations
 
+import secrets
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-import aiofiles.os
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.typing import ConfigType
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
-from .const import DOMAIN
+from .const import CONF_FEED_TOKEN, DOMAIN
+from .coordinator import EsolatCoordinator
+from .http import CalendarFeedView, ImsakiyahView
+from .islamic_events import IslamicEventsData
+from .prayer_times import PrayerTimesData
+from .services import async_setup_services
+
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.CALENDAR, Platform.SENSOR]
 
-PLATFORMS: list[Platform] = [Platform.CALENDAR, Platform.SENSOR]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+LEGACY_CALENDAR_UNIQUE_ID = "esolat_takwim"
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the eSolat Takwim Malaysia services and views."""
+    hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
+    hass.http.register_view(ImsakiyahView(hass))
+    hass.http.register_view(CalendarFeedView(hass))
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up eSolat Takwim Malaysia from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    if CONF_FEED_TOKEN not in entry.data:
+        # Entries created before the calendar feed; set before the update
+        # listener is added so this does not trigger a reload
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_FEED_TOKEN: secrets.token_urlsafe()}
+        )
+
+    coordinator = EsolatCoordinator(hass, entry)
+    entry.async_on_unload(coordinator.async_shutdown)
+    await coordinator.async_load_cached_data()
+    await coordinator.async_config_entry_first_refresh()
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    @callback
+    def _async_migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        """Make the single-instance calendar unique ID entry specific."""
+        if entity_entry.unique_id == LEGACY_CALENDAR_UNIQUE_ID:
+            return {"new_unique_id": f"{DOMAIN}_{entry.entry_id}_calendar"}
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, _async_migrate_unique_id)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when the zone changes."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry and clean up storage files."""
+    """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        prayer_times_file = hass.config.path("storage", "esolat_prayer_times.json")
-        events_file = hass.config.path("storage", "esolat_events.json")
-        
-        for file_path in (prayer_times_file, events_file):
-            if await aiofiles.os.path.exists(file_path):
-                try:
-                    await aiofiles.os.remove(file_path)
-                    _LOGGER.debug("Removed storage file %s", file_path)
-                except OSError as err:
-                    _LOGGER.warning("Failed to remove storage file %s: %s", file_path, err)
-
         hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove cached data that no remaining entry uses."""
+    remaining = [
+        other for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ]
+    zone = entry.data["zone"]
+    if not any(other.data["zone"] == zone for other in remaining):
+        await PrayerTimesData(zone, hass).async_remove_storage()
+        _LOGGER.debug("Removed prayer times storage for zone %s", zone)
+    if not remaining:
+        await IslamicEventsData(hass).async_remove_storage()
+        _LOGGER.debug("Removed Islamic events storage")
@@ -0,0 +1,204 @@
+"""HTTP helpers for the e-solat.gov.my API."""
+from __future__ import annotations
+
+import asyncio
+import codecs
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import json
+import logging
+from typing import Any
+
+import aiohttp
+
+from .const import REQUEST_BACKOFF, REQUEST_BACKOFF_MAX, REQUEST_RETRIES, REQUEST_TIMEOUT
+from .timing import TimingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",:]}"
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class EsolatApiError(Exception):
+    """Raised when the eSolat API cannot be reached or returns an error."""
+
+
+@asynccontextmanager
+async def async_request(
+    session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Send a request, retrying timeouts, network errors and 5xx with exponential backoff."""
+    delay = REQUEST_BACKOFF
+    for attempt in range(1, REQUEST_RETRIES + 1):
+        try:
+            response = await session.request(method, url, timeout=_TIMEOUT, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            error = f"{type(err).__name__}: {err}"
+        else:
+            if response.status < 500:
+                break
+            error = f"HTTP {response.status}"
+            response.release()
+
+        if attempt == REQUEST_RETRIES:
+            raise EsolatApiError(f"{error} after {attempt} attempts")
+        _LOGGER.debug("Request to %s failed (%s), retrying in %ds", url, error, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, REQUEST_BACKOFF_MAX)
+
+    try:
+        yield response
+    finally:
+        response.release()
+
+
+class JsonArrayStreamParser:
+    """Incrementally decode a JSON object, handing each item of one array member to a callback.
+
+    Only the unconsumed tail of the document is buffered, so memory stays
+    flat however long the array is. Other members are decoded whole into
+    `meta`.
+    """
+
+    def __init__(self, key: str, on_item: Callable[[Any], None]) -> None:
+        """Initialize the parser for the array member `key`."""
+        self.meta: dict[str, Any] = {}
+        self._array_key = key
+        self._on_item = on_item
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._final = False
+        self._state = "start"
+        self._key: str | None = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        """Consume the next chunk of the body; pass final=True once it is complete."""
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk, final)
+        self._pos = 0
+        self._final = final
+        self._advance()
+        if final and self._state != "done":
+            raise ValueError("Truncated JSON document")
+
+    def _next_char(self) -> str | None:
+        """Skip whitespace and return the next character, or None if more data is needed."""
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _expect(self, char: str, expected: str) -> None:
+        """Consume a structural character."""
+        if char not in expected:
+            raise ValueError(f"Expected {expected!r} at offset {self._pos}, got {char!r}")
+        self._pos += 1
+
+    def _decode(self) -> tuple[bool, Any]:
+        """Decode one value, returning (False, None) if it may continue in the next chunk."""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except ValueError:
+            if self._final:
+                raise
+            return False, None
+        if not self._final and (end == len(self._buf) or self._buf[end] not in _DELIMITERS):
+            # A number cut by the chunk boundary may continue in the next chunk
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _advance(self) -> None:
+        """Consume as much of the buffer as possible."""
+        while (char := self._next_char()) is not None:
+            state = self._state
+            if state == "start":
+                self._expect(char, "{")
+                self._state = "key"
+            elif state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                decoded, key = self._decode()
+                if not decoded:
+                    return
+                if not isinstance(key, str):
+                    raise ValueError(f"Expected an object key, got {key!r}")
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                self._state = "value"
+            elif state == "value":
+                if self._key == self._array_key and char == "[":
+                    self._pos += 1
+                    self._state = "first_item"
+                    continue
+                decoded, value = self._decode()
+                if not decoded:
+                    return
+                self.meta[self._key] = value
+                self._state = "member_end"
+            elif state == "first_item":
+                if char == "]":
+                    self._pos += 1
+                    self._state = "member_end"
+                else:
+                    self._state = "item"
+            elif state == "item":
+                decoded, value = self._decode()
+                if not decoded:
+                    return
+                self._on_item(value)
+                self._state = "item_end"
+            elif state == "item_end":
+                self._expect(char, ",]")
+                self._state = "item" if self._buf[self._pos - 1] == "," else "member_end"
+            elif state == "member_end":
+                self._expect(char, ",}")
+                self._state = "key" if self._buf[self._pos - 1] == "," else "done"
+            else:
+                raise ValueError(f"Unexpected data after the JSON document at offset {self._pos}")
+
+
+async def async_fetch_json_stream(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    key: str,
+    on_item: Callable[[Any], None],
+    stats: TimingStats | None = None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Send a request and decode the array member `key` item by item as the body arrives.
+
+    Each item is passed to `on_item`; the other members of the response
+    object are returned.
+    """
+    stats = stats or TimingStats()
+    parser = JsonArrayStreamParser(key, on_item)
+    size = 0
+    try:
+        with stats.measure("request"):
+            async with async_request(session, method, url, **kwargs) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    raise EsolatApiError(f"HTTP {response.status} - {body[:200]}")
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    size += len(chunk)
+                    parser.feed(chunk)
+                parser.feed(b"", final=True)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+        stats.count("request_errors")
+        raise EsolatApiError(f"{type(err).__name__}: {err}") from err
+    finally:
+        stats.count("payload_bytes", size)
+        stats.set("last_payload_bytes", size)
+    return parser.meta
@@ -0,0 +1,122 @@
+"""Offline prayer time calculation for eSolat Takwim Malaysia.
+
+Used to fill days the eSolat API has not provided, for example on a fresh
+install without network access. Follows JAKIM's parameters: Subuh at 20°
+and Isyak at 18° below the horizon, Asar at a shadow ratio of 1, Imsak ten minutes
+before Subuh, and ihtiyati (precautionary) minutes on every time.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from math import acos, asin, atan, atan2, ceil, cos, degrees, floor, radians, sin, tan
+
+from .const import TIMEZONE
+
+FAJR_ANGLE = 20.0
+ISHA_ANGLE = 18.0
+SUNRISE_ANGLE = 0.8333  # refraction plus the sun's semi-diameter
+ASR_SHADOW_FACTOR = 1
+IMSAK_OFFSET = timedelta(minutes=10)
+IHTIYATI = timedelta(minutes=2)
+
+UTC_OFFSET = 8  # Asia/Kuala_Lumpur has no daylight saving time
+_J2000 = date(2000, 1, 1).toordinal()  # J2000.0, with day ordinals taken at 12:00 UT
+
+
+def _solar_positions(days: Sequence[date], longitude: float) -> tuple[list[float], list[float]]:
+    """Return the sun's declination (radians) and equation of time (hours) per day."""
+    declinations = []
+    equations = []
+    for day in days:
+        # Days since J2000.0 at approximate local noon
+        d = day.toordinal() - _J2000 - longitude / 360
+        g = radians((357.529 + 0.98560028 * d) % 360)
+        q = (280.459 + 0.98564736 * d) % 360
+        ecliptic_longitude = radians((q + 1.915 * sin(g) + 0.020 * sin(2 * g)) % 360)
+        obliquity = radians(23.439 - 0.00000036 * d)
+        right_ascension = degrees(
+            atan2(cos(obliquity) * sin(ecliptic_longitude), cos(ecliptic_longitude))
+        ) / 15 % 24
+        equation = q / 15 - right_ascension
+        equations.append((equation + 12) % 24 - 12)
+        declinations.append(asin(sin(obliquity) * sin(ecliptic_longitude)))
+    return declinations, equations
+
+
+def _hour_angles(latitude: float, declinations: list[float], altitudes: list[float]) -> list[float]:
+    """Return hour angles (hours) at which the sun reaches each day's altitude (radians)."""
+    return [
+        degrees(acos(max(-1.0, min(1.0, (sin(altitude) - sin(latitude) * sin(declination))
+                                   / (cos(latitude) * cos(declination)))))) / 15
+        for declination, altitude in zip(declinations, altitudes)
+    ]
+
+
+def _to_datetime(day: date, hours: float, round_up: bool) -> datetime:
+    """Convert local clock hours to an aware datetime rounded to the minute."""
+    minutes = hours * 60
+    minutes = ceil(minutes) if round_up else floor(minutes)
+    return datetime(day.year, day.month, day.day, tzinfo=TIMEZONE) + timedelta(minutes=minutes)
+
+
+def compute_prayer_times(
+    latitude: float, longitude: float, days: Sequence[date]
+) -> list[dict[str, datetime]]:
+    """Compute the prayer times of many days in one batch.
+
+    The solar ephemeris is evaluated once per day and each prayer is then
+    derived column-wise across the whole batch.
+    """
+    lat = radians(latitude)
+    declinations, equations = _solar_positions(days, longitude)
+    transits = [12 + UTC_OFFSET - longitude / 15 - equation for equation in equations]
+
+    fajr = _hour_angles(lat, declinations, [radians(-FAJR_ANGLE)] * len(days))
+    sunrise = _hour_angles(lat, declinations, [radians(-SUNRISE_ANGLE)] * len(days))
+    isha = _hour_angles(lat, declinations, [radians(-ISHA_ANGLE)] * len(days))
+    asr = _hour_angles(
+        lat,
+        declinations,
+        [atan(1 / (ASR_SHADOW_FACTOR + tan(abs(lat - declination)))) for declination in declinations],
+    )
+
+    ihtiyati = IHTIYATI.total_seconds() / 3600
+    results = []
+    for i, day in enumerate(days):
+        transit = transits[i]
+        times = {
+            "fajr": _to_datetime(day, transit - fajr[i] + ihtiyati, True),
+            "syuruk": _to_datetime(day, transit - sunrise[i] - ihtiyati, False),
+            "dhuhr": _to_datetime(day, transit + ihtiyati, True),
+            "asr": _to_datetime(day, transit + asr[i] + ihtiyati, True),
+            "maghrib": _to_datetime(day, transit + sunrise[i] + ihtiyati, True),
+            "isha": _to_datetime(day, transit + isha[i] + ihtiyati, True),
+        }
+        results.append({"imsak": times["fajr"] - IMSAK_OFFSET, **times})
+    return results
+
+
+def compare_prayer_times(
+    reference: Sequence[dict[str, datetime]], computed: Sequence[dict[str, datetime]]
+) -> dict[str, dict[str, float | int]]:
+    """Summarise how far computed times deviate from reference times, per prayer.
+
+    Deviations are in minutes, positive when the computed time is later.
+    """
+    deviations: dict[str, list[float]] = {}
+    for ref_times, calc_times in zip(reference, computed):
+        for prayer, ref_time in ref_times.items():
+            if (calc_time := calc_times.get(prayer)) is not None:
+                deviations.setdefault(prayer, []).append(
+                    (calc_time - ref_time).total_seconds() / 60
+                )
+    return {
+        prayer: {
+            "days": len(values),
+            "mean": round(sum(values) / len(values), 2),
+            "mean_abs": round(sum(abs(value) for value in values) / len(values), 2),
+            "max_abs": max(abs(value) for value in values),
+        }
+        for prayer, values in deviations.items()
+    }
@@ -0,0 +1,108 @@
+"""Binary sensor platform for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt
+
+from .const import DOMAIN, REMINDER_PRAYERS, TIMEZONE
+from .coordinator import EsolatCoordinator
+from .entity import EsolatEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the eSolat Takwim Malaysia binary sensor platform."""
+    coordinator: EsolatCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        PrayerReminderSensor(coordinator, prayer, config_entry.entry_id) for prayer in REMINDER_PRAYERS
+    )
+
+class PrayerReminderSensor(EsolatEntity, BinarySensorEntity):
+    """On during the configured minutes before a prayer, off at the prayer time."""
+
+    _attr_icon = "mdi:bell-ring"
+    _unrecorded_attributes = frozenset({"offset"})
+
+    def __init__(self, coordinator: EsolatCoordinator, prayer: str, entry_id: str) -> None:
+        """Initialize the reminder sensor."""
+        super().__init__(coordinator)
+        self._prayer = prayer
+        self._attr_name = f"{prayer.capitalize()} reminder"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{prayer}_reminder"
+        self.entity_id = f"binary_sensor.esolat_takwim_{prayer}_reminder"
+        self._attr_is_on = False
+        self._attr_extra_state_attributes = {}
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        self._next_transition: datetime | None = None
+        self._update_from_data()
+
+    async def async_added_to_hass(self) -> None:
+        """Arm the transition timer once the entity is added."""
+        await super().async_added_to_hass()
+        self._async_schedule_transition()
+        self.async_on_remove(self._async_cancel_transition)
+
+    @callback
+    def _async_cancel_transition(self) -> None:
+        """Cancel the pending transition timer."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    def _update_from_data(self) -> bool:
+        """Compute the state and the next on/off transition from the schedule."""
+        now = dt.now(TIMEZONE)
+        offset = self.coordinator.reminder_offset
+        instant = next(
+            (instant for instant, prayer in self.coordinator.upcoming_prayers(now) if prayer == self._prayer),
+            None,
+        )
+        if instant is None:
+            is_on, attributes, self._next_transition = False, {}, None
+        else:
+            is_on = instant - offset <= now
+            self._next_transition = instant if is_on else instant - offset
+            attributes = {
+                "prayer_time": instant.isoformat(),
+                "offset": int(offset.total_seconds() // 60),
+            }
+
+        if is_on == self._attr_is_on and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_is_on = is_on
+        self._attr_extra_state_attributes = attributes
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update from new data and re-arm the transition timer."""
+        super()._handle_coordinator_update()
+        self._async_schedule_transition()
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Arm a single timer for the next time the reminder turns on or off."""
+        self._async_cancel_transition()
+        if self._next_transition is not None:
+            self._unsub_transition = async_track_point_in_time(
+                self.hass, self._async_handle_transition, self._next_transition
+            )
+
+    @callback
+    def _async_handle_transition(self, now: datetime) -> None:
+        """Flip the state at the scheduled instant."""
+        self._unsub_transition = None
+        if self._update_from_data():
+            self.async_write_ha_state()
+        self._async_schedule_transition()
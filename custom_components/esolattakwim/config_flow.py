@@ -1,14 +1,31 @@
 """Config flow for eSolat Takwim Malaysia integration."""
 from __future__ import annotations
 
+import secrets
+from typing import Any
+
 import voluptuous as vol
 import logging
 
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, ZONES
+from .const import (
+    CONF_EVENT_OFFSETS,
+    CONF_FEED_TOKEN,
+    CONF_REFRESH_INTERVAL,
+    CONF_REMINDER_OFFSET,
+    DEFAULT_EVENT_OFFSETS,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_REMINDER_OFFSET,
+    DOMAIN,
+    IMSAKIYAH_OFFSETS,
+    ZONES,
+)
+from .coordinator import parse_offsets
+from .zone_registry import async_get_zone_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,15 +38,13 @@ class EsolatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, str] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         errors = {}
 
         if user_input is not None:
+            zone = user_input["zone"]
             return self.async_create_entry(
-                title="eSolat Takwim Malaysia",
-                data={"zone": user_input["zone"]}
+                title=f"eSolat Takwim Malaysia ({zone.upper()})",
+                data={"zone": zone, CONF_FEED_TOKEN: secrets.token_urlsafe()}
             )
 
         return self.async_show_form(
@@ -52,19 +67,37 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
     """Handle options flow for eSolat Takwim Malaysia."""
 
     async def async_step_init(
-        self, user_input: dict[str, str] | None = None
+        self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
         errors = {}
 
         if user_input is not None:
+            try:
+                parse_offsets(user_input[CONF_EVENT_OFFSETS])
+            except ValueError:
+                errors[CONF_EVENT_OFFSETS] = "invalid_offsets"
+
+        if user_input is not None and not errors:
             new_zone = user_input["zone"]
+            if new_zone != self.config_entry.data.get("zone"):
+                # Warm the new zone in the background; the reload joins the
+                # download, or fills days offline if the API is unavailable
+                self.hass.async_create_task(
+                    async_get_zone_registry(self.hass).async_prefetch(
+                        {new_zone}, async_get_clientsession(self.hass)
+                    )
+                )
             _LOGGER.debug("Updating zone to %s", new_zone)
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
-                data={"zone": new_zone}
+                title=f"eSolat Takwim Malaysia ({new_zone.upper()})",
+                data={**self.config_entry.data, "zone": new_zone}
+            )
+            return self.async_create_entry(
+                title="",
+                data={key: value for key, value in user_input.items() if key != "zone"}
             )
-            return self.async_create_entry(title="", data={})
 
         return self.async_show_form(
             step_id="init",
@@ -72,7 +105,26 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                 vol.Required(
                     "zone",
                     default=self.config_entry.data.get("zone", "sgr01")
-                ): vol.In(ZONES)
+                ): vol.In(ZONES),
+                vol.Required(
+                    CONF_REFRESH_INTERVAL,
+                    default=self.config_entry.options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                vol.Required(
+                    CONF_REMINDER_OFFSET,
+                    default=self.config_entry.options.get(CONF_REMINDER_OFFSET, DEFAULT_REMINDER_OFFSET)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                vol.Required(
+                    CONF_EVENT_OFFSETS,
+                    default=self.config_entry.options.get(CONF_EVENT_OFFSETS, DEFAULT_EVENT_OFFSETS)
+                ): str,
+                **{
+                    vol.Required(
+                        option,
+                        default=self.config_entry.options.get(option, 0)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=-60, max=60))
+                    for option in IMSAKIYAH_OFFSETS.values()
+                },
             }),
             errors=errors,
         )
\ No newline at end of file
@@ -3,13 +3,61 @@ from datetime import timedelta
 from zoneinfo import ZoneInfo
 
 DOMAIN = "esolattakwim"
+DATA_ZONE_REGISTRY = f"{DOMAIN}_zone_registry"
 SCAN_INTERVAL = timedelta(days=1)
+UPDATE_INTERVAL = timedelta(minutes=15)
+FETCH_RETRY_INTERVAL = timedelta(minutes=15)
+EVENTS_REFRESH_INTERVAL = timedelta(days=7)
+
+# Options
+CONF_REFRESH_INTERVAL = "refresh_interval"
+DEFAULT_REFRESH_INTERVAL = 24  # hours
+CONF_IMSAK_OFFSET = "imsak_offset"
+CONF_FAJR_OFFSET = "fajr_offset"
+CONF_MAGHRIB_OFFSET = "maghrib_offset"
+CONF_REMINDER_OFFSET = "reminder_offset"
+DEFAULT_REMINDER_OFFSET = 15  # minutes
+REMINDER_PRAYERS = ["fajr", "dhuhr", "asr", "maghrib", "isha"]
+CONF_EVENT_OFFSETS = "event_offsets"
+CONF_FEED_TOKEN = "feed_token"
+DEFAULT_EVENT_OFFSETS = "15"  # comma separated minutes before each prayer
+IMSAKIYAH_OFFSETS = {"imsak": CONF_IMSAK_OFFSET, "fajr": CONF_FAJR_OFFSET, "maghrib": CONF_MAGHRIB_OFFSET}
+
+# Services
+SERVICE_REFRESH = "refresh"
+SERVICE_PREFETCH_ZONES = "prefetch_zones"
+SERVICE_COMPARE_OFFLINE = "compare_offline"
+SERVICE_GET_IMSAKIYAH = "get_imsakiyah"
+SERVICE_GET_PRAYER_TIMES = "get_prayer_times"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ZONES = "zones"
+ATTR_FORCE = "force"
+ATTR_HIJRI_YEAR = "hijri_year"
+ATTR_ZONE = "zone"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+MAX_QUERY_DAYS = 731
+
+# Events
+EVENT_PRAYER = f"{DOMAIN}_prayer"
+
+# HTTP views
+IMSAKIYAH_URL = "/api/esolattakwim/imsakiyah/{entry_id}.{format}"
+ICS_URL = "/api/esolattakwim/calendar/{entry_id}/{token}.ics"
+LINK_EXPIRATION = timedelta(days=365)  # lifetime of signed export links
 TIMEZONE = ZoneInfo("Asia/Kuala_Lumpur")
 
 # API endpoints
 ISLAMIC_EVENTS_API = "https://www.e-solat.gov.my/index.php?r=esolatApi/islamicevent&type=all"
 PRAYER_TIMES_API = "https://www.e-solat.gov.my/index.php?r=esolatApi/takwimsolat&period=duration&zone={zone}"
 
+# API request handling
+REQUEST_TIMEOUT = 30  # seconds per attempt
+REQUEST_RETRIES = 3
+REQUEST_BACKOFF = 2  # seconds, doubled after each failed attempt
+REQUEST_BACKOFF_MAX = 30  # seconds
+PREFETCH_CONCURRENCY = 4
+
 # Prayer names mapping
 PRAYER_NAMES = {
     "imsak": "Imsak",
@@ -99,3 +147,68 @@ ZONES = {
     "wly01": "WLY01 - Kuala Lumpur, Putrajaya",
     "wly02": "WLY02 - Labuan"
 }
+
+# Approximate reference coordinates (latitude, longitude) of each zone,
+# used by the offline prayer time calculator
+ZONE_COORDINATES = {
+    "jhr01": (2.4500, 104.5200),
+    "jhr02": (1.4927, 103.7414),
+    "jhr03": (2.0301, 103.3185),
+    "jhr04": (1.8548, 102.9325),
+    "kdh01": (6.1248, 100.3678),
+    "kdh02": (5.6470, 100.4877),
+    "kdh03": (5.8167, 100.7333),
+    "kdh04": (5.6766, 100.9167),
+    "kdh05": (5.3650, 100.5617),
+    "kdh06": (6.3500, 99.8000),
+    "kdh07": (5.7875, 100.4333),
+    "ktn01": (6.1254, 102.2381),
+    "ktn02": (4.8823, 101.9644),
+    "mlk01": (2.1896, 102.2501),
+    "ngs01": (2.4701, 102.2302),
+    "ngs02": (2.7389, 102.2487),
+    "ngs03": (2.7259, 101.9378),
+    "phg01": (2.7900, 104.1700),
+    "phg02": (3.8077, 103.3260),
+    "phg03": (3.4500, 102.4167),
+    "phg04": (3.7936, 101.8573),
+    "phg05": (3.3600, 101.7900),
+    "phg06": (4.4700, 101.3800),
+    "phg07": (2.8000, 103.4800),
+    "pls01": (6.4414, 100.1986),
+    "png01": (5.4141, 100.3288),
+    "prk01": (4.1976, 101.2610),
+    "prk02": (4.5975, 101.0901),
+    "prk03": (5.4333, 101.1167),
+    "prk04": (5.4000, 101.3000),
+    "prk05": (4.0259, 101.0213),
+    "prk06": (4.8500, 100.7333),
+    "prk07": (4.8620, 100.7930),
+    "sbh01": (5.8402, 118.1179),
+    "sbh02": (5.8942, 117.5567),
+    "sbh03": (5.0268, 118.3270),
+    "sbh04": (4.2447, 117.8912),
+    "sbh05": (6.8837, 116.8477),
+    "sbh06": (6.0750, 116.5583),
+    "sbh07": (5.9804, 116.0735),
+    "sbh08": (5.3378, 116.1602),
+    "sbh09": (5.3473, 115.7455),
+    "sgr01": (3.0738, 101.5183),
+    "sgr02": (3.3400, 101.2500),
+    "sgr03": (3.0449, 101.4456),
+    "swk01": (4.7500, 115.0000),
+    "swk02": (4.3995, 113.9914),
+    "swk03": (3.1713, 113.0419),
+    "swk04": (2.2873, 111.8305),
+    "swk05": (2.1271, 111.5239),
+    "swk06": (1.2370, 111.4621),
+    "swk07": (1.4600, 110.4900),
+    "swk08": (1.5533, 110.3592),
+    "swk09": (4.9500, 115.5000),
+    "trg01": (5.3302, 103.1408),
+    "trg02": (5.8300, 102.5600),
+    "trg03": (5.0700, 103.0100),
+    "trg04": (4.7566, 103.4200),
+    "wly01": (3.1390, 101.6869),
+    "wly02": (5.2831, 115.2308),
+}
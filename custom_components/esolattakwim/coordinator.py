@@ -0,0 +1,259 @@
+"""Data update coordinator for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt
+
+from .const import (
+    CONF_EVENT_OFFSETS,
+    CONF_REFRESH_INTERVAL,
+    CONF_REMINDER_OFFSET,
+    DEFAULT_EVENT_OFFSETS,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_REMINDER_OFFSET,
+    DOMAIN,
+    EVENT_PRAYER,
+    EVENTS_REFRESH_INTERVAL,
+    FETCH_RETRY_INTERVAL,
+    IMSAKIYAH_OFFSETS,
+    PRAYER_NAMES,
+    TIMEZONE,
+    UPDATE_INTERVAL,
+)
+from .event_index import EventIndex
+from .prayer_times import DaySnapshot, PrayerTimesData
+from .timing import TimingStats
+from .zone_registry import async_get_zone_registry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_offsets(value: str) -> list[int]:
+    """Parse comma separated minutes, e.g. "15, 5", into sorted distinct positive offsets."""
+    offsets = {int(part) for part in value.split(",") if part.strip()}
+    if any(offset <= 0 or offset > 180 for offset in offsets):
+        raise ValueError("Offsets must be between 1 and 180 minutes")
+    return sorted(offsets, reverse=True)
+
+
+class EsolatCoordinator(DataUpdateCoordinator[PrayerTimesData]):
+    """Coordinate prayer times and Islamic events fetching for a config entry."""
+
+    config_entry: ConfigEntry
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the coordinator with the zone's shared prayer times."""
+        self.zone: str = config_entry.data["zone"]
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN}_{self.zone}",
+            update_interval=UPDATE_INTERVAL,
+        )
+        self._registry = async_get_zone_registry(hass)
+        self.prayer_times = self._registry.acquire(self.zone)
+        self.islamic_events_data = self._registry.islamic_events
+        self._released = False
+        self._force_refresh = False
+        self._last_attempt: datetime | None = None
+        self._boundaries: list[datetime] = []
+        self._boundary_events: dict[datetime, list[tuple[str, int]]] = {}
+        self._boundaries_key: tuple[date, int] | None = None
+        self._next_boundary: datetime | None = None
+        self._snapshot: DaySnapshot | None = None
+        self._snapshot_version = -1
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+        self.stats = TimingStats()
+
+    @property
+    def refresh_interval(self) -> timedelta:
+        """Return the configured interval between takwim refreshes."""
+        hours = self.config_entry.options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL)
+        return timedelta(hours=hours)
+
+    @property
+    def reminder_offset(self) -> timedelta:
+        """Return how long before a prayer its reminder turns on."""
+        return timedelta(minutes=self.config_entry.options.get(CONF_REMINDER_OFFSET, DEFAULT_REMINDER_OFFSET))
+
+    @property
+    def event_offsets(self) -> list[int]:
+        """Return the minutes before each prayer at which a reminder event fires."""
+        return parse_offsets(self.config_entry.options.get(CONF_EVENT_OFFSETS, DEFAULT_EVENT_OFFSETS))
+
+    def upcoming_prayers(self, now: datetime) -> list[tuple[datetime, str]]:
+        """Return today's and tomorrow's prayers after now, as sorted (instant, prayer) pairs."""
+        today = now.astimezone(TIMEZONE).date()
+        prayers: list[tuple[datetime, str]] = []
+        for day in (today, today + timedelta(days=1)):
+            if (row := self.prayer_times.get_day(day)) is not None:
+                prayers.extend(zip(row.instants, row.names))
+        return prayers[bisect_right(prayers, now, key=lambda prayer: prayer[0]):]
+
+    @property
+    def imsakiyah_offsets(self) -> dict[str, int]:
+        """Return the configured imsakiyah offsets in minutes, keyed by prayer."""
+        return {
+            prayer: self.config_entry.options.get(option, 0)
+            for prayer, option in IMSAKIYAH_OFFSETS.items()
+        }
+
+    @property
+    def islamic_events(self) -> EventIndex:
+        """Return the indexed Islamic events."""
+        return self.islamic_events_data.index
+
+    @property
+    def data_version(self) -> tuple[int, int]:
+        """Return a token that changes whenever prayer times or Islamic events change."""
+        return self.prayer_times.version, self.islamic_events_data.version
+
+    @property
+    def snapshot(self) -> DaySnapshot:
+        """Return today's formatted prayer times and Hijri date, shared by all entities."""
+        today = dt.now(TIMEZONE).date()
+        version = self.prayer_times.version
+        # Another entry sharing the zone may have refreshed the data meanwhile
+        if self._snapshot is None or self._snapshot.day != today or self._snapshot_version != version:
+            self._snapshot = self.prayer_times.get_snapshot(today)
+            self._snapshot_version = version
+        return self._snapshot
+
+    async def async_force_refresh(self) -> None:
+        """Download the takwim now, regardless of cache completeness."""
+        self._force_refresh = True
+        await self.async_refresh()
+
+    def _should_fetch(self) -> bool:
+        """Decide whether this update needs to hit the network."""
+        if self._force_refresh:
+            return True
+        if not self.prayer_times.needs_refresh(self.refresh_interval):
+            return False
+        # Don't hammer the API every tick while it is down and we still have data
+        if (
+            self.prayer_times.has_data
+            and self._last_attempt is not None
+            and dt.now(TIMEZONE) - self._last_attempt < FETCH_RETRY_INTERVAL
+        ):
+            return False
+        return True
+
+    async def async_load_cached_data(self) -> None:
+        """Load cached Islamic events and prayer times on initial setup."""
+        await self._registry.async_load(self.zone)
+        await self._registry.async_load_events()
+
+    async def _async_update_data(self) -> PrayerTimesData:
+        """Fetch prayer times and Islamic events when stale, falling back to cached data."""
+        with self.stats.measure("update"):
+            return await self._async_update()
+
+    async def _async_update(self) -> PrayerTimesData:
+        """Run one update, see _async_update_data."""
+        fetch_prayer_times = self._should_fetch()
+        force = self._force_refresh
+        fetch_events = force or self.islamic_events_data.needs_refresh(EVENTS_REFRESH_INTERVAL)
+        self._force_refresh = False
+        if not fetch_prayer_times and not fetch_events:
+            self._async_schedule_next_boundary()
+            return self.prayer_times
+
+        session = async_get_clientsession(self.hass)
+        if fetch_prayer_times:
+            self._last_attempt = dt.now(TIMEZONE)
+            # Fetch prayer times, but use cached data if it fails
+            success = await self._registry.async_fetch(self.zone, session, force=force)
+            if not success and not self.prayer_times.has_data:
+                _LOGGER.warning("No prayer times available in cache or API, calendar may be incomplete")
+            elif not success:
+                _LOGGER.info("Using cached prayer times data")
+
+        if fetch_events:
+            await self._registry.async_fetch_events(session)
+
+        if not self.prayer_times.has_data:
+            raise UpdateFailed(f"No prayer times available for zone {self.zone}")
+
+        self._async_schedule_next_boundary()
+        return self.prayer_times
+
+    @callback
+    def _async_update_boundaries(self, since: datetime) -> None:
+        """Rebuild the day's boundaries when the day or the takwim changed.
+
+        Keyed by the data version rather than reset by this coordinator's own
+        fetch, so entries sharing a zone all pick up a fetch made by any of
+        them. Events before `since` have already fired or passed and are left
+        out.
+        """
+        today = since.astimezone(TIMEZONE).date()
+        key = (today, self.prayer_times.version)
+        if self._boundaries_key == key:
+            return
+        midnight = datetime.combine(today + timedelta(days=1), time.min, tzinfo=TIMEZONE)
+        # Prayer events to fire at each instant, as (prayer, minutes before) pairs
+        events: dict[datetime, list[tuple[str, int]]] = {}
+        for prayer, snapshot in self.snapshot.prayers.items():
+            for offset in (0, *self.event_offsets):
+                instant = snapshot.instant - timedelta(minutes=offset)
+                if instant >= since:
+                    events.setdefault(instant, []).append((prayer, offset))
+        self._boundary_events = events
+        self._boundaries = sorted({*events, midnight})
+        self._boundaries_key = key
+
+    @callback
+    def _async_schedule_next_boundary(self) -> None:
+        """Arm a single timer for the next prayer instant, reminder offset or local midnight."""
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+        now = dt.now(TIMEZONE)
+        self._async_update_boundaries(now)
+        # Midnight is always the last boundary and always in the future
+        self._next_boundary = self._boundaries[bisect_right(self._boundaries, now)]
+        self._unsub_boundary = async_track_point_in_time(
+            self.hass, self._async_handle_boundary, self._next_boundary
+        )
+
+    @callback
+    def _async_handle_boundary(self, now: datetime) -> None:
+        """Fire the prayer events due now, push new state to entities and re-arm the timer."""
+        self._unsub_boundary = None
+        instant = self._next_boundary
+        # Another entry of the zone may have changed today's times since the timer was armed
+        self._async_update_boundaries(instant)
+        for prayer, offset in self._boundary_events.pop(instant, []):
+            self.hass.bus.async_fire(EVENT_PRAYER, {
+                "config_entry_id": self.config_entry.entry_id,
+                "zone": self.zone,
+                "prayer": prayer,
+                "name": PRAYER_NAMES.get(prayer, prayer),
+                "time": (instant + timedelta(minutes=offset)).isoformat(),
+                "offset": offset,
+                "reminder": offset > 0,
+                "estimated": self.snapshot.estimated,
+            })
+        self.async_update_listeners()
+        self._async_schedule_next_boundary()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the boundary timer, release the zone and shut down the coordinator."""
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+        if not self._released:
+            self._registry.release(self.zone)
+            self._released = True
+        await super().async_shutdown()
@@ -0,0 +1,68 @@
+"""Device triggers for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import InvalidDeviceAutomationConfig
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DOMAIN, EVENT_PRAYER, PRAYER_NAMES
+
+CONF_SUBTYPE = "subtype"
+
+TRIGGER_PRAYER_TIME = "prayer_time"
+TRIGGER_PRAYER_REMINDER = "prayer_reminder"
+TRIGGER_TYPES = {TRIGGER_PRAYER_TIME, TRIGGER_PRAYER_REMINDER}
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend({
+    vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+    vol.Required(CONF_SUBTYPE): vol.In(PRAYER_NAMES),
+})
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[str, Any]]:
+    """List the prayer time and reminder triggers of a takwim device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+            CONF_SUBTYPE: prayer,
+        }
+        for trigger_type in sorted(TRIGGER_TYPES)
+        for prayer in PRAYER_NAMES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen for the device's prayer events."""
+    device = dr.async_get(hass).async_get(config[CONF_DEVICE_ID])
+    if device is None or not device.config_entries:
+        raise InvalidDeviceAutomationConfig(f"Device {config[CONF_DEVICE_ID]} not found")
+
+    event_config = event_trigger.TRIGGER_SCHEMA({
+        event_trigger.CONF_PLATFORM: "event",
+        event_trigger.CONF_EVENT_TYPE: EVENT_PRAYER,
+        event_trigger.CONF_EVENT_DATA: {
+            "config_entry_id": next(iter(device.config_entries)),
+            "prayer": config[CONF_SUBTYPE],
+            "reminder": config[CONF_TYPE] == TRIGGER_PRAYER_REMINDER,
+        },
+    })
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
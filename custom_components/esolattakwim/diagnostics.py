@@ -0,0 +1,32 @@
+"""Diagnostics support for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_FEED_TOKEN, DOMAIN
+from .coordinator import EsolatCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics with timings of the fetch, parse, storage and query paths."""
+    coordinator: EsolatCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(entry.data, {CONF_FEED_TOKEN}),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "data_version": list(coordinator.data_version),
+            **coordinator.stats.as_dict(),
+        },
+        "prayer_times": coordinator.prayer_times.diagnostics(),
+        "islamic_events": coordinator.islamic_events_data.diagnostics(),
+    }
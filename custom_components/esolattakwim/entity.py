@@ -0,0 +1,43 @@
+"""Base entity for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from abc import abstractmethod
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import EsolatCoordinator
+
+
+class EsolatEntity(CoordinatorEntity[EsolatCoordinator]):
+    """Coordinator entity that only writes its state when something changed."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: EsolatCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._last_available: bool | None = None
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+            name=coordinator.config_entry.title,
+            manufacturer="JAKIM",
+            model=f"eSolat Takwim {coordinator.zone.upper()}",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url="https://www.e-solat.gov.my",
+        )
+
+    @abstractmethod
+    def _update_from_data(self) -> bool:
+        """Update state and attributes from the coordinator, returning True if they changed."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value, attributes or availability differ."""
+        changed = self._update_from_data()
+        available = self.available
+        if changed or available != self._last_available:
+            self._last_available = available
+            super()._handle_coordinator_update()
@@ -0,0 +1,45 @@
+"""Sorted event index for eSolat Takwim Malaysia calendar queries."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from homeassistant.components.calendar import CalendarEvent
+
+
+class EventIndex:
+    """Calendar events sorted by start, answering range queries with bisect."""
+
+    def __init__(self, events: Iterable[CalendarEvent] = ()) -> None:
+        """Build the index from an iterable of events."""
+        self._events = sorted(events, key=lambda event: event.start)
+        self._starts = [event.start for event in self._events]
+        self._max_duration = max(
+            (event.end - event.start for event in self._events), default=timedelta(0)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._events)
+
+    @property
+    def events(self) -> list[CalendarEvent]:
+        """Return all events sorted by start."""
+        return self._events
+
+    def next_after(self, now: datetime) -> CalendarEvent | None:
+        """Return the first event starting at or after now."""
+        index = bisect_left(self._starts, now)
+        return self._events[index] if index < len(self._events) else None
+
+    def between(self, start_date: datetime, end_date: datetime) -> list[CalendarEvent]:
+        """Return events starting or ending within the range, sorted by start."""
+        # Only events starting no earlier than the longest event can end inside the range
+        lo = bisect_left(self._starts, start_date - self._max_duration)
+        hi = bisect_right(self._starts, end_date)
+        return [
+            event for event in self._events[lo:hi]
+            if start_date <= event.start <= end_date
+            or start_date <= event.end <= end_date
+        ]
@@ -0,0 +1,106 @@
+"""Hijri calendar index for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import date
+import logging
+
+from .const import HIJRI_MONTHS
+
+_LOGGER = logging.getLogger(__name__)
+
+RAMADHAN = 9
+SYAWAL = 10
+
+HijriDate = tuple[int, int, int]  # (year, month, day)
+
+
+def parse_hijri(hijri: str) -> HijriDate:
+    """Parse a takwim Hijri date (YYYY-MM-DD)."""
+    year, month, day = hijri.split("-")
+    return int(year), int(month), int(day)
+
+
+def format_hijri(hijri: HijriDate) -> str:
+    """Format a Hijri date as "DD Month YYYY"."""
+    year, month, day = hijri
+    return f"{day:02d} {HIJRI_MONTHS.get(f'{month:02d}', 'Unknown')} {year}"
+
+
+class HijriIndex:
+    """Gregorian and Hijri lookups over the JAKIM takwim.
+
+    Built once whenever the day table changes. Date conversions are dict
+    lookups and month queries bisect per-month lists of start ordinals.
+    """
+
+    def __init__(self, days: Iterable[tuple[int, str]] = ()) -> None:
+        """Build the index from (Gregorian ordinal, "YYYY-MM-DD" Hijri) pairs."""
+        self._to_hijri: dict[int, HijriDate] = {}
+        self._to_gregorian: dict[HijriDate, int] = {}
+        for ordinal, hijri in days:
+            try:
+                parsed = parse_hijri(hijri)
+            except ValueError:
+                _LOGGER.debug("Ignoring malformed Hijri date %s", hijri)
+                continue
+            self._to_hijri[ordinal] = parsed
+            self._to_gregorian[parsed] = ordinal
+
+        # Month bounds, inferred from any day of the month since days are consecutive
+        self._months: dict[tuple[int, int], int] = {}
+        for hijri, ordinal in self._to_gregorian.items():
+            self._months.setdefault(hijri[:2], ordinal - hijri[2] + 1)
+
+        self._starts_by_month: dict[int, list[int]] = {}
+        for (_, month), start in sorted(self._months.items(), key=lambda item: item[1]):
+            self._starts_by_month.setdefault(month, []).append(start)
+
+    def __len__(self) -> int:
+        """Return the number of indexed days."""
+        return len(self._to_hijri)
+
+    def to_hijri(self, day: date) -> HijriDate | None:
+        """Return the Hijri date of a Gregorian day."""
+        return self._to_hijri.get(day.toordinal())
+
+    def to_gregorian(self, year: int, month: int, day: int) -> date | None:
+        """Return the Gregorian day of a Hijri date."""
+        ordinal = self._to_gregorian.get((year, month, day))
+        return date.fromordinal(ordinal) if ordinal is not None else None
+
+    def month_bounds(self, year: int, month: int) -> tuple[date | None, date | None]:
+        """Return the first and last Gregorian day of a Hijri month, when known.
+
+        The last day is only known once the next month's first day, or the
+        month's 30th day, is in the takwim.
+        """
+        start = self._months.get((year, month))
+        if start is None:
+            return None, None
+        next_key = (year + 1, 1) if month == 12 else (year, month + 1)
+        if (next_start := self._months.get(next_key)) is not None:
+            end = next_start - 1
+        elif (year, month, 30) in self._to_gregorian:
+            end = start + 29
+        else:
+            return date.fromordinal(start), None
+        return date.fromordinal(start), date.fromordinal(end)
+
+    def next_month_start(self, month: int, day: date) -> date | None:
+        """Return the first day of the given Hijri month on or after a day."""
+        starts = self._starts_by_month.get(month, [])
+        index = bisect_left(starts, day.toordinal())
+        return date.fromordinal(starts[index]) if index < len(starts) else None
+
+    def days_until(self, month: int, day: date) -> int | None:
+        """Return the days from a day until the next start of a Hijri month."""
+        start = self.next_month_start(month, day)
+        return (start - day).days if start is not None else None
+
+    def between(self, start: date, end: date) -> Iterator[tuple[date, HijriDate]]:
+        """Iterate the Gregorian days and Hijri dates within a range."""
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            if (hijri := self._to_hijri.get(ordinal)) is not None:
+                yield date.fromordinal(ordinal), hijri
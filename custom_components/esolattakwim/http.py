@@ -0,0 +1,118 @@
+"""HTTP views for eSolat Takwim Malaysia exports and feeds."""
+from __future__ import annotations
+
+import csv
+import hashlib
+import hmac
+import io
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+
+from .const import CONF_FEED_TOKEN, DOMAIN, ICS_URL, IMSAKIYAH_URL, TIMEZONE
+from .coordinator import EsolatCoordinator
+from .ics import render_ics
+from .prayer_times import IMSAKIYAH_PRAYERS
+from .zone_registry import async_get_zone_registry
+
+
+def imsakiyah_to_csv(table: dict) -> str:
+    """Render an imsakiyah table as CSV with one row per day."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=["date", "day", *IMSAKIYAH_PRAYERS])
+    writer.writeheader()
+    writer.writerows(table["days"])
+    return output.getvalue()
+
+
+class ImsakiyahView(HomeAssistantView):
+    """Serve an entry's Ramadhan imsakiyah timetable as CSV or JSON."""
+
+    url = IMSAKIYAH_URL.replace("{format}", "{fmt}")
+    name = f"api:{DOMAIN}:imsakiyah"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, entry_id: str, fmt: str) -> web.Response:
+        """Return the timetable, optionally for another Hijri year."""
+        coordinator: EsolatCoordinator | None = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None:
+            return self.json_message("Config entry not found", HTTPStatus.NOT_FOUND)
+        if fmt not in ("csv", "json"):
+            return self.json_message("Format must be csv or json", HTTPStatus.BAD_REQUEST)
+
+        hijri_year = request.query.get("hijri_year")
+        try:
+            hijri_year = int(hijri_year) if hijri_year else None
+        except ValueError:
+            return self.json_message("Invalid hijri_year", HTTPStatus.BAD_REQUEST)
+
+        table = coordinator.prayer_times.get_imsakiyah(hijri_year, coordinator.imsakiyah_offsets)
+        if table is None:
+            return self.json_message("Ramadhan is not in the takwim", HTTPStatus.NOT_FOUND)
+
+        if fmt == "json":
+            return self.json(table)
+        filename = f"imsakiyah_{table['zone']}_{table['hijri_year']}.csv"
+        return web.Response(
+            text=imsakiyah_to_csv(table),
+            content_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+
+class CalendarFeedView(HomeAssistantView):
+    """Serve an entry's prayer times and Islamic events as an iCalendar feed.
+
+    Calendar apps cannot send credentials, so the link shown on the calendar
+    entity carries the entry's feed token instead, which stays valid across
+    restarts. The document is rendered once per data version and served
+    with an ETag, so polling clients with a current copy only get a 304.
+    """
+
+    url = ICS_URL
+    name = f"api:{DOMAIN}:calendar"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+        self._cache: dict[str, tuple[tuple[int, int], str, str]] = {}
+
+    async def get(self, request: web.Request, entry_id: str, token: str) -> web.Response:
+        """Return the feed, or 304 if the client's copy is current."""
+        coordinator: EsolatCoordinator | None = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if (
+            coordinator is None
+            or not hmac.compare_digest(token, coordinator.config_entry.data[CONF_FEED_TOKEN])
+            or not coordinator.prayer_times.has_data
+        ):
+            return self.json_message("Config entry not found", HTTPStatus.NOT_FOUND)
+
+        registry = async_get_zone_registry(self.hass)
+        zone = coordinator.zone
+        prayer_times = coordinator.prayer_times
+
+        version = (prayer_times.version, registry.islamic_events.version)
+        cached = self._cache.get(zone)
+        if cached is None or cached[0] != version:
+            body = render_ics(
+                zone,
+                prayer_times.iter_events(),
+                registry.islamic_events.index.events,
+                dt.now(TIMEZONE),
+            )
+            etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+            cached = self._cache[zone] = (version, body, etag)
+
+        _, body, etag = cached
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(text=body, content_type="text/calendar", charset="utf-8", headers=headers)
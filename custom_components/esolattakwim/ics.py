@@ -0,0 +1,90 @@
+"""iCalendar rendering for eSolat Takwim Malaysia feeds."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import zlib
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.util import dt
+
+PRODID = "-//eSolat Takwim Malaysia//Home Assistant//EN"
+UTC_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545 section 3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line longer than 75 octets."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        # Don't split a UTF-8 sequence
+        while cut and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    parts.append(encoded.decode())
+    return "\r\n ".join(parts)
+
+
+def render_ics(
+    zone: str,
+    prayer_events: Iterable[CalendarEvent],
+    islamic_events: Iterable[CalendarEvent],
+    generated: datetime,
+) -> str:
+    """Render prayer times and Islamic events as a VCALENDAR document.
+
+    Prayer times are timed events in UTC; Islamic events are all-day events.
+    """
+    stamp = generated.astimezone(dt.UTC).strftime(UTC_FORMAT)
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:eSolat Takwim {zone.upper()}",
+        "X-WR-TIMEZONE:Asia/Kuala_Lumpur",
+    ]
+    for event in prayer_events:
+        start = event.start.astimezone(dt.UTC)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{zone}-{start.strftime(UTC_FORMAT)}@esolattakwim",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{start.strftime(UTC_FORMAT)}",
+            f"DTEND:{event.end.astimezone(dt.UTC).strftime(UTC_FORMAT)}",
+            f"SUMMARY:{_escape(event.summary)}",
+            *([f"DESCRIPTION:{_escape(event.description)}"] if event.description else []),
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]
+    for event in islamic_events:
+        day = event.start.date()
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:event-{day.strftime('%Y%m%d')}-{zlib.crc32(event.summary.encode()):08x}@esolattakwim",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{_escape(event.summary)}",
+            *([f"DESCRIPTION:{_escape(event.description)}"] if event.description else []),
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
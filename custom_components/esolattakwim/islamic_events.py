@@ -0,0 +1,206 @@
+"""Islamic events data handling for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt
+
+from .api import EsolatApiError, async_request
+from .const import ISLAMIC_EVENTS_API, TIMEZONE
+from .event_index import EventIndex
+from .timing import TimingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IslamicEventsStore(Store[dict[str, Any]]):
+    """Store for Islamic events, migrating older storage formats."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: Any
+    ) -> dict[str, Any]:
+        """Migrate the v1 bare event list to a document carrying validators."""
+        if old_major_version == 1:
+            old_data = {"hash": None, "etag": None, "last_modified": None, "last_fetch": None, "events": old_data}
+        return old_data
+
+
+class IslamicEventsData:
+    """Class to handle the Islamic events feed."""
+
+    STORAGE_VERSION = 2
+    STORAGE_KEY = "esolat_events"
+
+    def __init__(self, hass) -> None:
+        """Initialize the Islamic events data with Home Assistant instance."""
+        self.hass = hass
+        self.index = EventIndex()
+        self.version = 0
+        self._hash: str | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_fetch: datetime | None = None
+        self.stats = TimingStats()
+        self._store = IslamicEventsStore(hass, self.STORAGE_VERSION, self.STORAGE_KEY)
+
+    async def load_cached_data(self) -> None:
+        """Load cached Islamic events and their validators from storage."""
+        cached_data = await self._store.async_load()
+        if not cached_data:
+            _LOGGER.debug("No cached Islamic events found")
+            return
+
+        self._hash = cached_data.get("hash")
+        self._etag = cached_data.get("etag")
+        self._last_modified = cached_data.get("last_modified")
+        last_fetch = cached_data.get("last_fetch")
+        self._last_fetch = datetime.fromisoformat(last_fetch) if last_fetch else None
+        self._set_events(
+            CalendarEvent(
+                summary=event["summary"],
+                start=datetime.fromisoformat(event["start"]) if isinstance(event["start"], str) else event["start"],
+                end=datetime.fromisoformat(event["end"]) if isinstance(event["end"], str) else event["end"],
+                description=event.get("description", "")
+            )
+            for event in cached_data.get("events", [])
+        )
+        _LOGGER.debug("Loaded cached Islamic events")
+
+    async def save_events(self) -> None:
+        """Save Islamic events, their validators and the last check to persistent storage."""
+        with self.stats.measure("save"):
+            await self._store.async_save({
+                "hash": self._hash,
+                "etag": self._etag,
+                "last_modified": self._last_modified,
+                "last_fetch": self._last_fetch.isoformat() if self._last_fetch else None,
+                "events": [
+                    {
+                        "summary": e.summary,
+                        "start": e.start.isoformat(),
+                        "end": e.end.isoformat(),
+                        "description": e.description or ""
+                    }
+                    for e in self.index.events
+                ],
+            })
+        _LOGGER.debug("Saved Islamic events")
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the state of the events feed and its timing statistics."""
+        return {
+            "events": len(self.index),
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "last_fetch": self._last_fetch.isoformat() if self._last_fetch else None,
+            "version": self.version,
+            **self.stats.as_dict(),
+        }
+
+    async def async_remove_storage(self) -> None:
+        """Remove the events persistent storage."""
+        await self._store.async_remove()
+
+    def needs_refresh(self, refresh_interval: timedelta) -> bool:
+        """Return True if the feed has not been checked within the refresh interval."""
+        return self._last_fetch is None or dt.now(TIMEZONE) - self._last_fetch >= refresh_interval
+
+    def _set_events(self, events) -> None:
+        """Replace the indexed events."""
+        self.index = EventIndex(events)
+        self.version += 1
+
+    async def fetch_islamic_events(self, session: aiohttp.ClientSession) -> bool:
+        """Fetch the feed, skipping parsing and storage when it is unchanged.
+
+        Returns True if the events changed.
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        try:
+            with self.stats.measure("request"):
+                async with async_request(session, "GET", ISLAMIC_EVENTS_API, headers=headers) as response:
+                    if response.status == 304:
+                        body = None
+                    elif response.status != 200:
+                        _LOGGER.warning("Failed to fetch Islamic events, HTTP %d: %s, using cached events",
+                                      response.status, (await response.text())[:200])
+                        return False
+                    else:
+                        body = await response.read()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+        except (EsolatApiError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.stats.count("request_errors")
+            _LOGGER.warning("Failed to fetch Islamic events: %s, using cached events", err)
+            return False
+
+        # The check time is stored too, so a restart does not download the feed again
+        self._last_fetch = dt.now(TIMEZONE)
+        if body is None:
+            self.stats.count("not_modified")
+            _LOGGER.debug("Islamic events not modified")
+            await self.save_events()
+            return False
+
+        self.stats.count("payload_bytes", len(body))
+        self.stats.set("last_payload_bytes", len(body))
+        content_hash = hashlib.sha256(body).hexdigest()
+        if content_hash == self._hash and self.index:
+            self.stats.count("unchanged")
+            _LOGGER.debug("Islamic events unchanged")
+            await self.save_events()
+            return False
+
+        try:
+            with self.stats.measure("decode"):
+                data = json.loads(body)
+        except ValueError as err:
+            _LOGGER.warning("Invalid JSON from eSolat API: %s, using cached events", err)
+            return False
+        if data.get("status") != "OK!":
+            _LOGGER.warning("Invalid response from eSolat API: %s, using cached events", data)
+            return False
+
+        events = []
+        with self.stats.measure("parse"):
+            for event in data.get("event", []):
+                try:
+                    date_str = f"{event['tarikh_miladi']} 00:00:00"
+                    naive_dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+                    start = naive_dt.replace(tzinfo=TIMEZONE)
+                    end = start.replace(hour=23, minute=59, second=59)
+                    events.append(
+                        CalendarEvent(
+                            summary=event["hari_peristiwa"].strip(),
+                            start=start,
+                            end=end,
+                            description=event.get("tarikh_desc", ""),
+                        )
+                    )
+                except (KeyError, ValueError) as err:
+                    _LOGGER.error("Error parsing event: %s", err)
+                    continue
+
+        self.stats.set("events", len(events))
+
+        self._hash = content_hash
+        self._etag = etag
+        self._last_modified = last_modified
+        self._set_events(events)
+        await self.save_events()
+        _LOGGER.info("Successfully updated Islamic events from API")
+        return True
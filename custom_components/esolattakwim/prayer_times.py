@@ -1,85 +1,374 @@
 """Prayer times data handling for eSolat Takwim Malaysia."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from calendar import isleap
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 import logging
-from typing import Dict, Optional, Tuple
+from time import perf_counter
+from typing import Any, Optional, Tuple
 import aiohttp
-from aiohttp import FormData
 
 from homeassistant.components.calendar import CalendarEvent
 from homeassistant.util import dt
 from homeassistant.helpers.storage import Store
 
-from .const import PRAYER_NAMES, PRAYER_TIMES_API, TIMEZONE
-from .utils import format_prayer_times, get_next_prayer_info
+from .api import EsolatApiError, async_fetch_json_stream
+from .astronomy import compare_prayer_times, compute_prayer_times
+from .const import PRAYER_NAMES, PRAYER_TIMES_API, TIMEZONE, ZONE_COORDINATES
+from .hijri import RAMADHAN, SYAWAL, HijriDate, HijriIndex, format_hijri
+from .timing import TimingStats
+from .utils import get_next_prayer_info
 
 _LOGGER = logging.getLogger(__name__)
 
+DATE_FORMAT = "%d-%b-%Y"
+PRAYER_EVENT_DURATION = timedelta(minutes=15)
+EVENT_CACHE_SIZE = 16
+MERGE_GAP_DAYS = 7  # join missing ranges separated by fewer cached days
+REVALIDATE_DAYS = 30  # days re-downloaded on a periodic refresh of a complete table
+IMSAKIYAH_PRAYERS = ("imsak", "fajr", "maghrib")
+ESTIMATED_DESCRIPTION = "Estimated offline, not yet published by JAKIM"
+
+
+@dataclass(frozen=True, slots=True)
+class PrayerDay:
+    """Pre-parsed prayer times of a single day, sorted by time."""
+
+    day: date
+    hijri: str | None
+    names: tuple[str, ...]
+    instants: tuple[datetime, ...]
+    estimated: bool = False  # computed offline rather than published by JAKIM
+
+    @property
+    def times(self) -> dict[str, datetime]:
+        """Return the prayer instants keyed by prayer."""
+        return dict(zip(self.names, self.instants))
+
+    def events(self) -> list[CalendarEvent]:
+        """Build the calendar events of this day, sorted by start."""
+        events = []
+        for prayer, instant in zip(self.names, self.instants):
+            start = instant.replace(second=0)
+            events.append(
+                CalendarEvent(
+                    summary=PRAYER_NAMES[prayer],
+                    start=start,
+                    end=start + PRAYER_EVENT_DURATION,
+                    description=ESTIMATED_DESCRIPTION if self.estimated else None,
+                )
+            )
+        return events
+
+
+@dataclass(frozen=True, slots=True)
+class PrayerSnapshot:
+    """One prayer of the day, preformatted for entity states and attributes."""
+
+    instant: datetime
+    utc: str
+    time_12h: str
+    time_24h: str
+
+
+@dataclass(frozen=True, slots=True)
+class DaySnapshot:
+    """Everything entities show about a day, formatted once and shared by all of them."""
+
+    day: date
+    hijri_date: str | None
+    hijri_full: str | None
+    prayers: dict[str, PrayerSnapshot]
+    hijri: HijriDate | None = None
+    hijri_month_start: date | None = None
+    hijri_month_end: date | None = None
+    days_until_ramadhan: int | None = None
+    days_until_syawal: int | None = None
+    estimated: bool = False
+
+    @classmethod
+    def from_day(cls, day: date, row: PrayerDay | None, hijri_index: HijriIndex) -> DaySnapshot:
+        """Build the snapshot of a day, empty if the day has no prayer times."""
+        hijri = hijri_index.to_hijri(day)
+        month_start, month_end = hijri_index.month_bounds(*hijri[:2]) if hijri else (None, None)
+        calendar = {
+            "hijri": hijri,
+            "hijri_month_start": month_start,
+            "hijri_month_end": month_end,
+            "days_until_ramadhan": hijri_index.days_until(RAMADHAN, day),
+            "days_until_syawal": hijri_index.days_until(SYAWAL, day),
+        }
+        if row is None:
+            return cls(day=day, hijri_date=None, hijri_full=None, prayers={}, **calendar)
+
+        return cls(
+            day=day,
+            hijri_date=row.hijri,
+            hijri_full=format_hijri(hijri) if hijri else None,
+            estimated=row.estimated,
+            **calendar,
+            prayers={
+                prayer: PrayerSnapshot(
+                    instant=instant,
+                    utc=instant.astimezone(dt.UTC).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                    time_12h=instant.strftime("%I:%M %p"),
+                    time_24h=instant.strftime("%H:%M"),
+                )
+                for prayer, instant in zip(row.names, row.instants)
+            },
+        )
+
+    @property
+    def instants(self) -> list[datetime]:
+        """Return the sorted prayer instants of the day."""
+        return [prayer.instant for prayer in self.prayers.values()]
+
+    @property
+    def utc_times(self) -> dict[str, str]:
+        """Return the UTC ISO timestamps keyed by prayer."""
+        return {name: prayer.utc for name, prayer in self.prayers.items()}
+
+
+def parse_prayer_day(date_str: str, raw: dict[str, Any]) -> PrayerDay:
+    """Parse a takwim row ("%d-%b-%Y" date, "HH:MM:SS" times) into a PrayerDay."""
+    day = datetime.strptime(date_str, DATE_FORMAT).date()
+    prayers: list[tuple[datetime, str]] = []
+    for prayer in PRAYER_NAMES:
+        time_str = raw.get(prayer)
+        if not time_str:
+            continue
+        time_parts = time_str.split(":")
+        if len(time_parts) < 2:
+            continue
+        hour = int(time_parts[0])
+        minute = int(time_parts[1])
+        second = int(time_parts[2]) if len(time_parts) > 2 else 0
+        prayers.append(
+            (datetime(day.year, day.month, day.day, hour, minute, second, tzinfo=TIMEZONE), prayer)
+        )
+    prayers.sort()
+    return PrayerDay(
+        day=day,
+        hijri=raw.get("hijri"),
+        names=tuple(prayer for _, prayer in prayers),
+        instants=tuple(instant for instant, _ in prayers),
+    )
+
+
+def prayer_day_to_row(row: PrayerDay) -> list[Any]:
+    """Pack a PrayerDay as [ordinal, hijri, minutes since midnight per prayer]."""
+    times = row.times
+    return [
+        row.day.toordinal(),
+        row.hijri,
+        *(
+            instant.hour * 60 + instant.minute if (instant := times.get(prayer)) else None
+            for prayer in PRAYER_NAMES
+        ),
+    ]
+
+
+def prayer_day_from_row(row: list[Any]) -> PrayerDay:
+    """Unpack a stored row into a PrayerDay."""
+    day = date.fromordinal(row[0])
+    prayers = sorted(
+        (datetime(day.year, day.month, day.day, minutes // 60, minutes % 60, tzinfo=TIMEZONE), prayer)
+        for prayer, minutes in zip(PRAYER_NAMES, row[2:])
+        if minutes is not None
+    )
+    return PrayerDay(
+        day=day,
+        hijri=row[1],
+        names=tuple(prayer for _, prayer in prayers),
+        instants=tuple(instant for instant, _ in prayers),
+    )
+
+
+class PrayerTimesStore(Store[dict[str, Any]]):
+    """Store for prayer times, migrating older storage formats."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Migrate the v1 string dictionary (plus expanded events) to compact rows."""
+        if old_major_version == 1:
+            days = []
+            for date_str, raw in old_data.get("daily_prayer_times", {}).items():
+                try:
+                    days.append(prayer_day_to_row(parse_prayer_day(date_str, raw)))
+                except (KeyError, ValueError) as err:
+                    _LOGGER.error("Error migrating cached prayer time for %s: %s", date_str, err)
+            days.sort()
+            old_data = {
+                "zone": old_data.get("zone"),
+                "last_update_year": old_data.get("last_update_year"),
+                "last_fetch": old_data.get("last_fetch"),
+                "days": days,
+            }
+        return old_data
+
+
 class PrayerTimesData:
     """Class to handle prayer times data."""
 
-    STORAGE_VERSION = 1
-    STORAGE_KEY = "esolat_prayer_times"  # Static key
+    STORAGE_VERSION = 2
+    STORAGE_KEY = "esolat_prayer_times_{zone}"
+    LEGACY_STORAGE_KEY = "esolat_prayer_times"  # Single-zone key used before multi-zone support
 
     def __init__(self, zone: str, hass) -> None:
         """Initialize the prayer times data with Home Assistant instance."""
-        self._prayer_times: dict[str, list[CalendarEvent]] = {}
         self._last_update_year: int | None = None
-        self._daily_prayer_times: Dict[str, Dict[str, str]] = {}
+        self._days: dict[int, PrayerDay] = {}  # keyed by date ordinal
+        self._year_counts: Counter[int] = Counter()
+        self._first_ordinal = 0
+        self._last_ordinal = -1
+        self._events_cache: OrderedDict[tuple[datetime, datetime], list[CalendarEvent]] = OrderedDict()
+        self.hijri = HijriIndex()
+        self.version = 0
+        self._changed = False  # day table modified since the indexes were rebuilt
+        self.stats = TimingStats()
+        self._last_fetch: datetime | None = None
         self._zone = zone
         self.hass = hass
-        self._store = Store(hass, self.STORAGE_VERSION, self.STORAGE_KEY)
+        self._store = PrayerTimesStore(hass, self.STORAGE_VERSION, self.STORAGE_KEY.format(zone=zone))
+        self._saved_content: tuple[Any, ...] | None = None
 
     async def load_cached_data(self) -> None:
         """Load cached prayer times from storage, checking zone consistency."""
-        cached_data = await self._store.async_load()
+        with self.stats.measure("load"):
+            cached_data = await self._store.async_load()
+        if not cached_data:
+            cached_data = await self._async_load_legacy_data()
         if cached_data:
             cached_zone = cached_data.get("zone")
             if cached_zone != self._zone:
                 _LOGGER.warning("Cached prayer times zone (%s) does not match current zone (%s), clearing cache", cached_zone, self._zone)
-                self._daily_prayer_times = {}
-                self._prayer_times = {}
+                self._days = {}
                 self._last_update_year = None
+                self._last_fetch = None
             else:
-                self._daily_prayer_times = cached_data.get("daily_prayer_times", {})
+                days = cached_data.get("days", [])
+                self.load_rows(days)
                 self._last_update_year = cached_data.get("last_update_year")
-                prayer_times_raw = cached_data.get("prayer_times", {})
-                self._prayer_times = {
-                    prayer: [
-                        CalendarEvent(
-                            summary=event["summary"],
-                            start=datetime.fromisoformat(event["start"]) if isinstance(event["start"], str) else event["start"],
-                            end=datetime.fromisoformat(event["end"]) if isinstance(event["end"], str) else event["end"]
-                        )
-                        for event in events
-                    ]
-                    for prayer, events in prayer_times_raw.items()
-                }
+                last_fetch = cached_data.get("last_fetch")
+                self._last_fetch = datetime.fromisoformat(last_fetch) if last_fetch else None
+                self._saved_content = (self._zone, self._last_update_year, last_fetch, days)
                 _LOGGER.debug("Loaded cached prayer times for zone %s", self._zone)
         else:
             _LOGGER.debug("No cached prayer times found")
 
+    def load_rows(self, rows: list[list[Any]]) -> None:
+        """Replace the day table with stored rows and rebuild the indexes."""
+        self._days = {}
+        for row in rows:
+            try:
+                self._add_day(prayer_day_from_row(row))
+            except (IndexError, TypeError, ValueError) as err:
+                _LOGGER.error("Error parsing cached prayer time row %s: %s", row, err)
+        self._rebuild_indexes()
+
+    def to_rows(self) -> list[list[Any]]:
+        """Return the published days as stored rows, sorted by date."""
+        # Estimated days are recomputed instantly, only persist published ones
+        return [
+            prayer_day_to_row(self._days[ordinal])
+            for ordinal in sorted(self._days)
+            if not self._days[ordinal].estimated
+        ]
+
+    async def _async_load_legacy_data(self) -> dict[str, Any] | None:
+        """Adopt the pre multi-zone cache if it belongs to this zone."""
+        legacy_store = PrayerTimesStore(self.hass, self.STORAGE_VERSION, self.LEGACY_STORAGE_KEY)
+        legacy_data = await legacy_store.async_load()
+        if not legacy_data or legacy_data.get("zone") != self._zone:
+            return None
+        await self._store.async_save(legacy_data)
+        await legacy_store.async_remove()
+        _LOGGER.debug("Moved legacy prayer times cache to zone %s storage", self._zone)
+        return legacy_data
+
+    async def async_remove_storage(self) -> None:
+        """Remove the zone's persistent storage."""
+        await self._store.async_remove()
+
     async def save_data(self) -> None:
-        """Save prayer times to persistent storage with zone code."""
+        """Save prayer times to persistent storage, skipping writes when nothing changed."""
+        days = self.to_rows()
+        last_fetch = self._last_fetch.isoformat() if self._last_fetch else None
+        # The fetch time is part of the content so needs_refresh holds across restarts
+        content = (self._zone, self._last_update_year, last_fetch, days)
+        if content == self._saved_content:
+            self.stats.count("saves_skipped")
+            _LOGGER.debug("Prayer times for zone %s unchanged, skipping save", self._zone)
+            return
+
         data = {
-            "zone": self._zone,  # Add zone code to JSON
-            "daily_prayer_times": self._daily_prayer_times,
-            "prayer_times": {
-                prayer: [{"summary": e.summary, "start": e.start.isoformat(), "end": e.end.isoformat()}
-                         for e in events]
-                for prayer, events in self._prayer_times.items()
-            },
-            "last_update_year": self._last_update_year
+            "zone": self._zone,
+            "last_update_year": self._last_update_year,
+            "last_fetch": last_fetch,
+            "days": days,
         }
-        await self._store.async_save(data)
+        with self.stats.measure("save"):
+            await self._store.async_save(data)
+        self._saved_content = content
         _LOGGER.debug("Saved prayer times for zone %s", self._zone)
 
+    @property
+    def zone(self) -> str:
+        """Return the zone of this takwim."""
+        return self._zone
+
+    @property
+    def has_data(self) -> bool:
+        """Return True if any prayer times are available."""
+        return bool(self._days)
+
+    def get_day(self, day: date) -> PrayerDay | None:
+        """Get the pre-parsed prayer times of a day."""
+        return self._days.get(day.toordinal())
+
+    def _add_day(self, row: PrayerDay) -> None:
+        """Insert or replace a day in the table."""
+        ordinal = row.day.toordinal()
+        if self._days.get(ordinal) != row:
+            self._days[ordinal] = row
+            self._changed = True
+
+    def needs_refresh(self, refresh_interval: timedelta) -> bool:
+        """Return True if the cached takwim is incomplete or older than the refresh interval."""
+        now = dt.now(TIMEZONE)
+        if self._last_update_year != now.year:
+            return True
+
+        years = [now.year, now.year + 1] if now.month == 12 else [now.year]
+        for year in years:
+            if self._year_counts[year] < (366 if isleap(year) else 365):
+                return True
+
+        return self._last_fetch is None or now - self._last_fetch >= refresh_interval
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the per-year day counts and Hijri index, and drop cached event windows."""
+        self._year_counts = Counter(row.day.year for row in self._days.values() if not row.estimated)
+        self.hijri = HijriIndex(
+            (ordinal, row.hijri) for ordinal, row in self._days.items() if row.hijri
+        )
+        self._first_ordinal = min(self._days, default=0)
+        self._last_ordinal = max(self._days, default=-1)
+        self._events_cache.clear()
+        self._changed = False
+        self.version += 1
+
     def get_todays_prayer_times(self) -> dict[str, str]:
         """Get prayer times for today."""
-        today = dt.now(TIMEZONE).strftime("%d-%b-%Y")
-        prayer_times = self._daily_prayer_times.get(today, {})
-        return format_prayer_times(prayer_times)
+        row = self.get_day(dt.now(TIMEZONE).date())
+        if row is None:
+            return {}
+        return {prayer: instant.strftime("%H:%M") for prayer, instant in zip(row.names, row.instants)}
 
     def get_next_prayer(self) -> Tuple[Optional[str], Optional[str]]:
         """Get the next prayer name and time."""
@@ -88,203 +377,336 @@ class PrayerTimesData:
 
     def get_prayer_times_utc(self) -> dict[str, str]:
         """Get prayer times for today in UTC format."""
-        today = dt.now(TIMEZONE).strftime("%d-%b-%Y")
-        local_prayer_times = self._daily_prayer_times.get(today, {})
-        utc_prayer_times = {}
-        
-        today_date = dt.now(TIMEZONE).date()
-        
-        for prayer, time_str in local_prayer_times.items():
-            try:
-                time_parts = time_str.split(":")
-                if len(time_parts) >= 2:
-                    hour = int(time_parts[0])
-                    minute = int(time_parts[1])
-                    second = int(time_parts[2]) if len(time_parts) > 2 else 0
-                    
-                    local_dt = datetime.combine(
-                        today_date,
-                        datetime.strptime(f"{hour:02d}:{minute:02d}:{second:02d}", "%H:%M:%S").time()
-                    ).replace(tzinfo=TIMEZONE)
-                    
-                    utc_dt = local_dt.astimezone(dt.UTC)
-                    utc_prayer_times[prayer] = utc_dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
-            except (ValueError, IndexError):
-                utc_prayer_times[prayer] = None
-                
-        return utc_prayer_times
+        return self.get_snapshot(dt.now(TIMEZONE).date()).utc_times
+
+    def get_snapshot(self, day: date) -> DaySnapshot:
+        """Get the formatted snapshot of a day."""
+        return DaySnapshot.from_day(day, self.get_day(day), self.hijri)
 
     def get_current_and_next_prayer(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Get the current and next prayer name and time."""
-        prayer_times = self.get_todays_prayer_times()
-        if not prayer_times:
-            return None, None, None
-
         now = dt.now(TIMEZONE)
-        current_time = now.time()
+        ordinal = now.date().toordinal()
+        today = self._days.get(ordinal)
+        if today is None or not today.instants:
+            return None, None, None
 
         current_prayer = None
         next_prayer = None
         next_prayer_time = None
 
-        def normalize_time(time_str: str) -> str:
-            """Ensure time is in %H:%M:%S format by adding seconds if missing."""
-            if len(time_str.split(":")) == 2:
-                return f"{time_str}:00"
-            return time_str
+        index = bisect_right(today.instants, now)
+        if index < len(today.instants):
+            next_prayer = PRAYER_NAMES.get(today.names[index], today.names[index])
+            next_prayer_time = today.instants[index].strftime("%H:%M:%S")
+        else:
+            tomorrow = self._days.get(ordinal + 1)
+            if tomorrow and tomorrow.instants:
+                next_prayer = PRAYER_NAMES.get(tomorrow.names[0], tomorrow.names[0])
+                next_prayer_time = tomorrow.instants[0].strftime("%H:%M:%S")
 
-        normalized_prayers = {
-            prayer: normalize_time(time_str) for prayer, time_str in prayer_times.items()
-        }
+        if index > 0:
+            current_prayer = PRAYER_NAMES.get(today.names[index - 1], today.names[index - 1])
+        else:
+            yesterday = self._days.get(ordinal - 1)
+            if yesterday and yesterday.names:
+                current_prayer = PRAYER_NAMES.get(yesterday.names[-1], yesterday.names[-1])
 
-        sorted_prayers = sorted(
-            [(k, v) for k, v in normalized_prayers.items() if ":" in v],
-            key=lambda x: datetime.strptime(x[1], "%H:%M:%S"),
-        )
+        return current_prayer, next_prayer, next_prayer_time
 
-        for i, (prayer, time_str) in enumerate(sorted_prayers):
-            prayer_time = datetime.strptime(time_str, "%H:%M:%S").time()
-            if prayer_time > current_time:
-                next_prayer = PRAYER_NAMES.get(prayer, prayer)
-                next_prayer_time = time_str
-                if i > 0:
-                    current_prayer = PRAYER_NAMES.get(sorted_prayers[i - 1][0], sorted_prayers[i - 1][0])
-                break
-
-        if not next_prayer and sorted_prayers:
-            current_prayer = PRAYER_NAMES.get(sorted_prayers[-1][0], sorted_prayers[-1][0])
-            next_day = (now + timedelta(days=1)).strftime("%d-%b-%Y")
-            next_day_prayer_times = self._daily_prayer_times.get(next_day, {})
-            if next_day_prayer_times:
-                sorted_next_day_prayers = sorted(
-                    [(k, v) for k, v in next_day_prayer_times.items() if ":" in v],
-                    key=lambda x: datetime.strptime(normalize_time(x[1]), "%H:%M:%S"),
-                )
-                if sorted_next_day_prayers:
-                    next_prayer = PRAYER_NAMES.get(sorted_next_day_prayers[0][0], sorted_next_day_prayers[0][0])
-                    next_prayer_time = normalize_time(sorted_next_day_prayers[0][1])
-
-        if not current_prayer:
-            previous_day = (now - timedelta(days=1)).strftime("%d-%b-%Y")
-            previous_prayer_times = self._daily_prayer_times.get(previous_day, {})
-            if previous_prayer_times:
-                sorted_previous_prayers = sorted(
-                    [(k, v) for k, v in previous_prayer_times.items() if ":" in v],
-                    key=lambda x: datetime.strptime(normalize_time(x[1]), "%H:%M:%S"),
-                )
-                if sorted_previous_prayers:
-                    current_prayer = PRAYER_NAMES.get(sorted_previous_prayers[-1][0], sorted_previous_prayers[-1][0])
+    def missing_ranges(self, first: date, last: date) -> list[tuple[date, date]]:
+        """Return the date ranges within first..last that are missing or only estimated.
+
+        Ranges separated by fewer than MERGE_GAP_DAYS cached days are joined so
+        a scattered table does not turn into many tiny requests, and ranges
+        never cross a year so each request stays within one takwim year.
+        """
+        ranges: list[list[int]] = []
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            row = self._days.get(ordinal)
+            if row is not None and not row.estimated:
+                continue
+            if ranges and ordinal - ranges[-1][1] <= MERGE_GAP_DAYS and (
+                date.fromordinal(ordinal).year == date.fromordinal(ranges[-1][0]).year
+            ):
+                ranges[-1][1] = ordinal
+            else:
+                ranges.append([ordinal, ordinal])
+        return [(date.fromordinal(start), date.fromordinal(end)) for start, end in ranges]
 
-        return current_prayer, next_prayer, next_prayer_time
+    async def fetch_prayer_times(self, session: aiohttp.ClientSession, force: bool = False) -> bool:
+        """Fetch the missing parts of the takwim, falling back to local data if fetch fails.
 
-    async def fetch_prayer_times(self, session: aiohttp.ClientSession) -> bool:
-        """Fetch prayer times for the current year and store Hijri dates, falling back to local data if fetch fails."""
-        current_year = dt.now(TIMEZONE).year
-        current_month = dt.now(TIMEZONE).month
+        Only days that are missing or estimated are requested. When the table
+        is already complete, the next REVALIDATE_DAYS are downloaded again to
+        pick up corrections; `force` downloads the whole window instead.
+        """
+        now = dt.now(TIMEZONE)
+        current_year = now.year
+        # Fetch next year’s data in December, purging will happen next year
+        last_year = current_year + 1 if now.month == 12 else current_year
+        first_day = date(current_year, 1, 1)
+        last_day = date(last_year, 12, 31)
 
-        async def _fetch_yearly_prayer_times(year: int) -> bool:
+        async def _fetch_range(start_date: date, end_date: date) -> bool:
             url = PRAYER_TIMES_API.format(zone=self._zone)
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year, 12, 31)
-
-            form_data = FormData()
-            form_data.add_field('datestart', start_date.strftime('%Y-%m-%d'))
-            form_data.add_field('dateend', end_date.strftime('%Y-%m-%d'))
+            parsed = 0
+            parse_seconds = 0.0
+
+            def _on_row(prayer_time: Any) -> None:
+                # Rows go straight into the day table as they are decoded, so
+                # the response body and its JSON tree are never held whole
+                nonlocal parsed, parse_seconds
+                start = perf_counter()
+                parsed += 1
+                try:
+                    self._add_day(parse_prayer_day(prayer_time["date"], prayer_time))
+                except (KeyError, TypeError, ValueError) as err:
+                    _LOGGER.error("Error parsing prayer time: %s", err)
+                parse_seconds += perf_counter() - start
 
             try:
-                async with session.post(url, data=form_data) as response:
-                    if response.status != 200:
-                        _LOGGER.warning("Failed to fetch prayer times for year %d: HTTP %d - %s", 
-                                       year, response.status, await response.text())
-                        return False
-
-                    data = await response.json()
-                    if data.get("status") != "OK!":
-                        _LOGGER.warning("Invalid response from eSolat Prayer Times API for year %d: %s", 
-                                       year, data)
-                        return False
-
-                    # If we have valid data, clear old prayer times and update
-                    self._prayer_times.clear()
-                    for prayer_time in data.get("prayerTime", []):
-                        try:
-                            date_str = prayer_time["date"]
-                            hijri_date = prayer_time["hijri"]
-                            self._daily_prayer_times[date_str] = {
-                                "hijri": hijri_date,
-                                **{prayer: prayer_time[prayer] for prayer in PRAYER_NAMES if prayer in prayer_time},
-                            }
-                            for prayer, display_name in PRAYER_NAMES.items():
-                                if prayer in prayer_time:
-                                    time_str = prayer_time[prayer]
-                                    time_parts = time_str.split(":")
-                                    if len(time_parts) >= 2:
-                                        hour = int(time_parts[0])
-                                        minute = int(time_parts[1])
-                                        date = datetime.strptime(date_str, "%d-%b-%Y").replace(tzinfo=TIMEZONE)
-                                        start = date.replace(hour=hour, minute=minute)
-                                        end_minute = (minute + 15) % 60
-                                        end_hour = hour + ((minute + 15) // 60)
-                                        end = date.replace(hour=end_hour, minute=end_minute)
-
-                                        event = CalendarEvent(
-                                            summary=f"{display_name}",
-                                            start=start,
-                                            end=end,
-                                        )
-                                        if prayer not in self._prayer_times:
-                                            self._prayer_times[prayer] = []
-                                        self._prayer_times[prayer].append(event)
-                        except (KeyError, ValueError) as err:
-                            _LOGGER.error("Error parsing prayer time: %s", err)
-                            continue
-                    return True
-            except aiohttp.ClientError as err:
-                _LOGGER.warning("Network error fetching prayer times for year %d: %s", year, err)
+                data = await async_fetch_json_stream(
+                    session,
+                    "POST",
+                    url,
+                    "prayerTime",
+                    _on_row,
+                    stats=self.stats,
+                    data={
+                        "datestart": start_date.strftime("%Y-%m-%d"),
+                        "dateend": end_date.strftime("%Y-%m-%d"),
+                    },
+                )
+            except EsolatApiError as err:
+                _LOGGER.warning("Failed to fetch prayer times for %s to %s: %s", start_date, end_date, err)
                 return False
+            finally:
+                self.stats.record("parse", parse_seconds)
+                self.stats.count("rows_parsed", parsed)
+
+            # The status follows the rows in the response; error responses carry none
+            if data.get("status") != "OK!":
+                _LOGGER.warning("Invalid response from eSolat Prayer Times API for %s to %s: %s",
+                               start_date, end_date, data)
+                return False
+            return True
 
         # Purge old data before fetching, but only save if fetch succeeds
         self._purge_old_prayer_times(current_year)
 
-        success = await _fetch_yearly_prayer_times(current_year)
-        if current_month == 12:
-            # Fetch next year’s data in December, purging will happen next year
-            success &= await _fetch_yearly_prayer_times(current_year + 1)
+        if force:
+            ranges = [
+                (date(year, 1, 1), date(year, 12, 31)) for year in range(current_year, last_year + 1)
+            ]
+        else:
+            ranges = self.missing_ranges(first_day, last_day) or [
+                (now.date(), min(now.date() + timedelta(days=REVALIDATE_DAYS), last_day))
+            ]
+        _LOGGER.debug("Fetching prayer times for zone %s: %s", self._zone, ranges)
+
+        success = True
+        with self.stats.measure("fetch"):
+            for start_date, end_date in ranges:
+                success &= await _fetch_range(start_date, end_date)
+        self.stats.count("ranges_fetched", len(ranges))
+
+        with self.stats.measure("fill_offline"):
+            self._fill_missing_days(first_day, last_day)
+        if self._changed:
+            # Only a real change invalidates caches keyed on the data version
+            with self.stats.measure("rebuild_indexes"):
+                self._rebuild_indexes()
 
         if success:
             self._last_update_year = current_year
+            self._last_fetch = dt.now(TIMEZONE)
             await self.save_data()
             _LOGGER.info("Successfully fetched and updated prayer times for zone %s", self._zone)
         else:
             _LOGGER.info("API fetch failed, relying on existing local prayer times data for zone %s", self._zone)
 
         # Return True if we have any usable data (new or cached)
-        return bool(self._daily_prayer_times)
+        return bool(self._days)
+
+    def _fill_missing_days(self, first: date, last: date) -> None:
+        """Fill days without published times using the offline calculator."""
+        if (coordinates := ZONE_COORDINATES.get(self._zone)) is None:
+            return
+        missing = [
+            date.fromordinal(ordinal)
+            for ordinal in range(first.toordinal(), last.toordinal() + 1)
+            if ordinal not in self._days
+        ]
+        if not missing:
+            return
+
+        for day, times in zip(missing, compute_prayer_times(*coordinates, missing)):
+            prayers = sorted((instant, prayer) for prayer, instant in times.items())
+            self._add_day(PrayerDay(
+                day=day,
+                hijri=None,
+                names=tuple(prayer for _, prayer in prayers),
+                instants=tuple(instant for instant, _ in prayers),
+                estimated=True,
+            ))
+        _LOGGER.info("Estimated prayer times offline for %d days in zone %s", len(missing), self._zone)
+
+    def get_rows(self, start: date, end: date) -> dict[str, Any]:
+        """Return compact per-day rows for a date range straight from the day table.
+
+        Each row holds the ISO date, the Hijri date, each prayer's "HH:MM" in
+        the order of `columns`, and whether the day was estimated offline.
+        Days missing from the table are skipped.
+        """
+        first = max(start.toordinal(), self._first_ordinal)
+        last = min(end.toordinal(), self._last_ordinal)
+        days = []
+        for ordinal in range(first, last + 1):
+            row = self._days.get(ordinal)
+            if row is None:
+                continue
+            times = row.times
+            days.append([
+                row.day.isoformat(),
+                row.hijri,
+                *(instant.strftime("%H:%M") if (instant := times.get(prayer)) else None for prayer in PRAYER_NAMES),
+                row.estimated,
+            ])
+        return {
+            "zone": self._zone,
+            "columns": ["date", "hijri", *PRAYER_NAMES, "estimated"],
+            "days": days,
+        }
+
+    def get_imsakiyah(
+        self, hijri_year: int | None = None, offsets: dict[str, int] | None = None
+    ) -> dict[str, Any] | None:
+        """Build the Ramadhan imsakiyah table in a single pass over the month's days.
+
+        Defaults to the current Ramadhan, or the next one. Offsets are minutes
+        added to imsak, fajr and maghrib. Returns None if the month is not in
+        the takwim.
+        """
+        if hijri_year is None:
+            today = dt.now(TIMEZONE).date()
+            hijri = self.hijri.to_hijri(today)
+            if hijri and hijri[1] == RAMADHAN:
+                hijri_year = hijri[0]
+            elif (start := self.hijri.next_month_start(RAMADHAN, today)) is not None:
+                hijri_year = self.hijri.to_hijri(start)[0]
+            else:
+                return None
+
+        first, last = self.hijri.month_bounds(hijri_year, RAMADHAN)
+        if first is None:
+            return None
+
+        deltas = {prayer: timedelta(minutes=minutes) for prayer, minutes in (offsets or {}).items()}
+        days = []
+        for day, (_, _, hijri_day) in self.hijri.between(first, last or first + timedelta(days=29)):
+            times = self._days[day.toordinal()].times
+            row: dict[str, Any] = {"date": day.isoformat(), "day": hijri_day}
+            for prayer in IMSAKIYAH_PRAYERS:
+                instant = times.get(prayer)
+                row[prayer] = (instant + deltas.get(prayer, timedelta(0))).strftime("%H:%M") if instant else None
+            days.append(row)
+
+        return {
+            "zone": self._zone,
+            "hijri_year": hijri_year,
+            "start": first.isoformat(),
+            "end": last.isoformat() if last else None,
+            "offsets": offsets or {},
+            "days": days,
+        }
+
+    def compare_with_offline(self) -> dict[str, Any]:
+        """Report how far the offline calculator deviates from the published times."""
+        coordinates = ZONE_COORDINATES.get(self._zone)
+        rows = [row for row in self._days.values() if not row.estimated]
+        if coordinates is None or not rows:
+            return {"zone": self._zone, "days": 0, "prayers": {}}
+        computed = compute_prayer_times(*coordinates, [row.day for row in rows])
+        return {
+            "zone": self._zone,
+            "latitude": coordinates[0],
+            "longitude": coordinates[1],
+            "days": len(rows),
+            "prayers": compare_prayer_times([row.times for row in rows], computed),
+        }
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the state of the day table and its timing statistics."""
+        return {
+            "zone": self._zone,
+            "days": len(self._days),
+            "estimated_days": sum(row.estimated for row in self._days.values()),
+            "first_day": date.fromordinal(self._first_ordinal).isoformat() if self._days else None,
+            "last_day": date.fromordinal(self._last_ordinal).isoformat() if self._days else None,
+            "last_update_year": self._last_update_year,
+            "last_fetch": self._last_fetch.isoformat() if self._last_fetch else None,
+            "version": self.version,
+            "events_cache_windows": len(self._events_cache),
+            "hijri_days": len(self.hijri),
+            **self.stats.as_dict(),
+        }
 
     def _purge_old_prayer_times(self, current_year: int) -> None:
         """Purge all prayer times before the current year."""
-        keys_to_delete = [
-            date_str for date_str in self._daily_prayer_times.keys()
-            if datetime.strptime(date_str, "%d-%b-%Y").year < current_year
-        ]
-        for key in keys_to_delete:
-            del self._daily_prayer_times[key]
-
-        for prayer in list(self._prayer_times.keys()):
-            self._prayer_times[prayer] = [
-                event for event in self._prayer_times[prayer]
-                if event.start.year >= current_year
-            ]
-            if not self._prayer_times[prayer]:
-                del self._prayer_times[prayer]
+        first_ordinal = date(current_year, 1, 1).toordinal()
+        for ordinal in [ordinal for ordinal in self._days if ordinal < first_ordinal]:
+            del self._days[ordinal]
+            self._changed = True
+
+    def get_next_event(self, now: datetime) -> CalendarEvent | None:
+        """Get the first prayer time event starting at or after now."""
+        ordinal = max(now.astimezone(TIMEZONE).date().toordinal(), self._first_ordinal)
+        while ordinal <= self._last_ordinal:
+            row = self._days.get(ordinal)
+            if row is not None:
+                for event in row.events():
+                    if event.start >= now:
+                        return event
+            ordinal += 1
+        return None
+
+    def iter_events(self) -> Iterator[CalendarEvent]:
+        """Iterate the prayer time events of every day in the table, in order."""
+        for ordinal in range(self._first_ordinal, self._last_ordinal + 1):
+            if (row := self._days.get(ordinal)) is not None:
+                yield from row.events()
 
     def get_events(self, start_date: datetime, end_date: datetime) -> list[CalendarEvent]:
-        """Get prayer time events within the specified date range."""
-        events = []
-        for prayer_events in self._prayer_times.values():
-            events.extend([
-                event for event in prayer_events
-                if start_date <= event.start <= end_date
-                or start_date <= event.end <= end_date
-            ])
-        return sorted(events, key=lambda x: x.start)
\ No newline at end of file
+        """Get prayer time events within the specified date range.
+
+        Events are built on demand from the day table; recently requested
+        windows are kept in a small LRU cache until the data changes.
+        """
+        key = (start_date, end_date)
+        cached = self._events_cache.get(key)
+        if cached is not None:
+            self._events_cache.move_to_end(key)
+            self.stats.count("events_cache_hits")
+            return cached
+        self.stats.count("events_cache_misses")
+
+        with self.stats.measure("get_events"):
+            first = (start_date - PRAYER_EVENT_DURATION).astimezone(TIMEZONE).date().toordinal()
+            last = end_date.astimezone(TIMEZONE).date().toordinal()
+            events = []
+            for ordinal in range(max(first, self._first_ordinal), min(last, self._last_ordinal) + 1):
+                row = self._days.get(ordinal)
+                if row is None:
+                    continue
+                events.extend(
+                    event for event in row.events()
+                    if start_date <= event.start <= end_date
+                    or start_date <= event.end <= end_date
+                )
+        self.stats.set("last_events_built", len(events))
+
+        self._events_cache[key] = events
+        if len(self._events_cache) > EVENT_CACHE_SIZE:
+            self._events_cache.popitem(last=False)
+        return events
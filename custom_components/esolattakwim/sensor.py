@@ -1,121 +1,337 @@
-"""Sensor platform for eSolat Takwim Malaysia."""
-from __future__ import annotations
-
-from datetime import datetime
-import logging
-from typing import Any
-
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import dt as dt_util
-
-from .const import DOMAIN, TIMEZONE, HIJRI_MONTHS
-from .prayer_times import PrayerTimesData
-
-_LOGGER = logging.getLogger(__name__)
-
-PRAYER_SENSORS = ["imsak", "fajr", "syuruk", "dhuhr", "asr", "maghrib", "isha"]
-
-async def async_setup_entry(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up the eSolat Takwim Malaysia sensor platform."""
-    zone = config_entry.data["zone"]
-    prayer_times = PrayerTimesData(zone, hass)
-    await prayer_times.load_cached_data()
-
-    entities = [HijriSensor(hass, prayer_times, config_entry.entry_id)]
-    entities.extend(PrayerTimeSensor(hass, prayer_times, prayer, config_entry.entry_id) for prayer in PRAYER_SENSORS)
-    async_add_entities(entities, True)
-
-class PrayerTimeSensor(SensorEntity):
-    """Representation of a prayer time sensor."""
-
-    _attr_device_class = SensorDeviceClass.TIMESTAMP
-    _attr_has_entity_name = True
-
-    def __init__(self, hass: HomeAssistant, prayer_times: PrayerTimesData, prayer: str, entry_id: str) -> None:
-        """Initialize the prayer time sensor."""
-        self.hass = hass
-        self._prayer_times = prayer_times
-        self._prayer = prayer
-        self._attr_name = prayer.capitalize()
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{prayer}"
-        self.entity_id = f"sensor.esolat_takwim_{prayer}"
-        self._attr_icon = "mdi:star-crescent"
-        self._state = None
-        self._attributes = {}
-        self._attr_entity_registry_enabled_default = True
-        self._attr_entity_registry_visible_default = True
-
-    @property
-    def state(self) -> str | None:
-        """Return the state of the sensor (UTC timestamp)."""
-        return self._state
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        return self._attributes
-
-    async def async_update(self) -> None:
-        """Update the sensor state and attributes."""
-        prayer_times = self._prayer_times.get_prayer_times_utc()
-        utc_time = prayer_times.get(self._prayer)
-        self._state = utc_time if utc_time else None
-        if utc_time and utc_time != "unknown":
-            local_dt = dt_util.parse_datetime(utc_time).astimezone(TIMEZONE)
-            self._attributes = {
-                "time_12h": local_dt.strftime("%I:%M %p"),
-                "time_24h": local_dt.strftime("%H:%M"),
-            }
-        else:
-            self._attributes = {"time_12h": "Unknown", "time_24h": "Unknown"}
-
-class HijriSensor(SensorEntity):
-    """Representation of a Hijri date sensor."""
-
-    _attr_has_entity_name = True
-    _attr_icon = "mdi:calendar"
-
-    def __init__(self, hass: HomeAssistant, prayer_times: PrayerTimesData, entry_id: str) -> None:
-        """Initialize the Hijri date sensor."""
-        self.hass = hass
-        self._prayer_times = prayer_times
-        self._attr_name = "Hijri Date"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_hijri"
-        self.entity_id = f"sensor.esolat_takwim_hijri"
-        self._attr_icon = "mdi:calendar"
-        self._state = None
-        self._attributes = {}
-        self._attr_entity_registry_enabled_default = True
-        self._attr_entity_registry_visible_default = True
-
-    @property
-    def state(self) -> str | None:
-        """Return the state of the sensor (full Hijri text)."""
-        return self._state
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        return self._attributes
-
-    async def async_update(self) -> None:
-        """Update the sensor state and attributes."""
-        today_date = dt_util.now(TIMEZONE).strftime("%d-%b-%Y")
-        today_prayer_times = self._prayer_times._daily_prayer_times.get(today_date, {})
-        hijri_date = today_prayer_times.get("hijri")
-
-        if hijri_date:
-            hijri_year, hijri_month, hijri_day = hijri_date.split("-")
-            month_name = HIJRI_MONTHS.get(hijri_month, "Unknown")
-            self._state = f"{int(hijri_day):02d} {month_name} {hijri_year}"
-            self._attributes = {"date": hijri_date}
-        else:
-            self._state = "Unknown"
-            self._attributes = {"date": "Unknown"}
\ No newline at end of file
+"""Sensor platform for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import logging
+from math import ceil
+
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, HIJRI_MONTHS, IMSAKIYAH_URL, LINK_EXPIRATION, PRAYER_NAMES, TIMEZONE
+from .coordinator import EsolatCoordinator
+from .entity import EsolatEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+PRAYER_SENSORS = ["imsak", "fajr", "syuruk", "dhuhr", "asr", "maghrib", "isha"]
+HIJRI_COUNTDOWNS = {"ramadhan": "days_until_ramadhan", "syawal": "days_until_syawal"}
+# key: (name, statistics source, timing name)
+TIMING_SENSORS = {
+    "update_duration": ("Update duration", "coordinator", "update"),
+    "fetch_duration": ("Takwim fetch duration", "prayer_times", "fetch"),
+    "parse_duration": ("Takwim parse duration", "prayer_times", "parse"),
+    "save_duration": ("Takwim save duration", "prayer_times", "save"),
+    "query_duration": ("Calendar query duration", "prayer_times", "get_events"),
+    "events_fetch_duration": ("Islamic events fetch duration", "islamic_events_data", "request"),
+}
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the eSolat Takwim Malaysia sensor platform."""
+    coordinator: EsolatCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    entities = [HijriSensor(coordinator, config_entry.entry_id)]
+    entities.extend(PrayerTimeSensor(coordinator, prayer, config_entry.entry_id) for prayer in PRAYER_SENSORS)
+    entities.extend(
+        HijriCountdownSensor(coordinator, month, config_entry.entry_id) for month in HIJRI_COUNTDOWNS
+    )
+    entities.append(ImsakiyahSensor(coordinator, config_entry.entry_id))
+    entities.append(NextPrayerCountdownSensor(coordinator, config_entry.entry_id))
+    entities.extend(
+        TimingSensor(coordinator, config_entry.entry_id, key, name, source, timing)
+        for key, (name, source, timing) in TIMING_SENSORS.items()
+    )
+    async_add_entities(entities)
+
+class PrayerTimeSensor(EsolatEntity, SensorEntity):
+    """Representation of a prayer time sensor."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _unrecorded_attributes = frozenset({"time_12h", "time_24h"})
+
+    def __init__(self, coordinator: EsolatCoordinator, prayer: str, entry_id: str) -> None:
+        """Initialize the prayer time sensor."""
+        super().__init__(coordinator)
+        self._prayer = prayer
+        self._attr_name = prayer.capitalize()
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{prayer}"
+        self.entity_id = f"sensor.esolat_takwim_{prayer}"
+        self._attr_icon = "mdi:star-crescent"
+        self._attr_native_value: datetime | None = None
+        self._attr_extra_state_attributes = {}
+        self._attr_entity_registry_enabled_default = True
+        self._attr_entity_registry_visible_default = True
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Update the sensor state and attributes."""
+        snapshot = self.coordinator.snapshot
+        prayer = snapshot.prayers.get(self._prayer)
+        if prayer:
+            value = prayer.instant
+            attributes = {
+                "time_12h": prayer.time_12h,
+                "time_24h": prayer.time_24h,
+                "estimated": snapshot.estimated,
+            }
+        else:
+            value = None
+            attributes = {"time_12h": "Unknown", "time_24h": "Unknown"}
+
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
+
+class HijriSensor(EsolatEntity, SensorEntity):
+    """Representation of a Hijri date sensor."""
+
+    _attr_icon = "mdi:calendar"
+
+    def __init__(self, coordinator: EsolatCoordinator, entry_id: str) -> None:
+        """Initialize the Hijri date sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Hijri Date"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_hijri"
+        self.entity_id = f"sensor.esolat_takwim_hijri"
+        self._attr_icon = "mdi:calendar"
+        self._attr_native_value: str | None = None
+        self._attr_extra_state_attributes = {}
+        self._attr_entity_registry_enabled_default = True
+        self._attr_entity_registry_visible_default = True
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Update the sensor state and attributes."""
+        snapshot = self.coordinator.snapshot
+
+        if snapshot.hijri_date:
+            value = snapshot.hijri_full
+            attributes = {"date": snapshot.hijri_date}
+            if snapshot.hijri:
+                year, month, day = snapshot.hijri
+                attributes.update({
+                    "year": year,
+                    "month": month,
+                    "day": day,
+                    "month_name": HIJRI_MONTHS.get(f"{month:02d}", "Unknown"),
+                    "month_start": snapshot.hijri_month_start.isoformat() if snapshot.hijri_month_start else None,
+                    "month_end": snapshot.hijri_month_end.isoformat() if snapshot.hijri_month_end else None,
+                })
+        else:
+            value = "Unknown"
+            attributes = {"date": "Unknown"}
+
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
+
+class HijriCountdownSensor(EsolatEntity, SensorEntity):
+    """Days until the start of a Hijri month."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+
+    def __init__(self, coordinator: EsolatCoordinator, month: str, entry_id: str) -> None:
+        """Initialize the countdown sensor."""
+        super().__init__(coordinator)
+        self._field = HIJRI_COUNTDOWNS[month]
+        self._attr_name = f"Days until {month.capitalize()}"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_days_until_{month}"
+        self.entity_id = f"sensor.esolat_takwim_days_until_{month}"
+        self._attr_native_value: int | None = None
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Update the number of days left, unknown beyond the downloaded takwim."""
+        value = getattr(self.coordinator.snapshot, self._field)
+        if value == self._attr_native_value:
+            return False
+        self._attr_native_value = value
+        return True
+
+class ImsakiyahSensor(EsolatEntity, SensorEntity):
+    """The Ramadhan imsakiyah timetable, with the first day of Ramadhan as state."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+    _attr_icon = "mdi:table-clock"
+    _unrecorded_attributes = frozenset({"days", "offsets", "csv_url", "json_url"})
+
+    def __init__(self, coordinator: EsolatCoordinator, entry_id: str) -> None:
+        """Initialize the imsakiyah sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Imsakiyah"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_imsakiyah"
+        self.entity_id = "sensor.esolat_takwim_imsakiyah"
+        self._entry_id = entry_id
+        self._attr_native_value: date | None = None
+        self._attr_extra_state_attributes = {}
+        self._table_version: tuple[int, date] | None = None
+        self._urls: dict[str, str] = {}
+        self._update_from_data()
+
+    async def async_added_to_hass(self) -> None:
+        """Sign the export links once the entity is added, so they open from a browser."""
+        await super().async_added_to_hass()
+        self._urls = {
+            f"{fmt}_url": async_sign_path(
+                self.hass,
+                IMSAKIYAH_URL.format(entry_id=self._entry_id, format=fmt),
+                LINK_EXPIRATION,
+                use_content_user=True,
+            )
+            for fmt in ("csv", "json")
+        }
+        self._table_version = None
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Rebuild the timetable when the takwim or the day changes."""
+        version = (self.coordinator.prayer_times.version, self.coordinator.snapshot.day)
+        if version == self._table_version:
+            return False
+        self._table_version = version
+
+        table = self.coordinator.prayer_times.get_imsakiyah(offsets=self.coordinator.imsakiyah_offsets)
+        if table is None:
+            value, attributes = None, {}
+        else:
+            value = date.fromisoformat(table["start"])
+            attributes = {
+                "hijri_year": table["hijri_year"],
+                "end": table["end"],
+                "offsets": table["offsets"],
+                "days": table["days"],
+                **self._urls,
+            }
+
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
+
+class NextPrayerCountdownSensor(EsolatEntity, SensorEntity):
+    """Whole minutes left until the next prayer, updated on minute boundaries."""
+
+    _attr_icon = "mdi:timer-sand"
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _unrecorded_attributes = frozenset({"prayer_time"})
+
+    def __init__(self, coordinator: EsolatCoordinator, entry_id: str) -> None:
+        """Initialize the countdown sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Minutes to next prayer"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_next_prayer_countdown"
+        self.entity_id = "sensor.esolat_takwim_next_prayer_countdown"
+        self._attr_native_value: int | None = None
+        self._attr_extra_state_attributes = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._next_tick: datetime | None = None
+        self._update_from_data()
+
+    async def async_added_to_hass(self) -> None:
+        """Arm the minute timer once the entity is added."""
+        await super().async_added_to_hass()
+        self._async_schedule_tick()
+        self.async_on_remove(self._async_cancel_tick)
+
+    @callback
+    def _async_cancel_tick(self) -> None:
+        """Cancel the pending minute timer."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    def _update_from_data(self) -> bool:
+        """Count the whole minutes to the next prayer, rounded up."""
+        now = dt_util.now(TIMEZONE)
+        upcoming = self.coordinator.upcoming_prayers(now)
+        if not upcoming:
+            value, attributes, self._next_tick = None, {}, None
+        else:
+            instant, prayer = upcoming[0]
+            seconds = (instant - now).total_seconds()
+            value = ceil(seconds / 60)
+            # Next change is when the remaining time drops below a whole minute
+            self._next_tick = instant - timedelta(minutes=value - 1) if value > 1 else instant
+            attributes = {"next_prayer": PRAYER_NAMES.get(prayer, prayer), "prayer_time": instant.isoformat()}
+
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update from new data and re-arm the minute timer."""
+        super()._handle_coordinator_update()
+        self._async_schedule_tick()
+
+    @callback
+    def _async_schedule_tick(self) -> None:
+        """Arm a single timer for the next minute boundary of the countdown."""
+        self._async_cancel_tick()
+        if self._next_tick is not None:
+            self._unsub_tick = async_track_point_in_time(self.hass, self._async_handle_tick, self._next_tick)
+
+    @callback
+    def _async_handle_tick(self, now: datetime) -> None:
+        """Write the new countdown and re-arm."""
+        self._unsub_tick = None
+        if self._update_from_data():
+            self.async_write_ha_state()
+        self._async_schedule_tick()
+
+class TimingSensor(EsolatEntity, SensorEntity):
+    """Last duration of an instrumented path, for diagnosing slow updates."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_icon = "mdi:timer-outline"
+    _unrecorded_attributes = frozenset({"count", "avg_ms"})
+
+    def __init__(
+        self, coordinator: EsolatCoordinator, entry_id: str, key: str, name: str, source: str, timing: str
+    ) -> None:
+        """Initialize the timing sensor."""
+        super().__init__(coordinator)
+        self._source = source
+        self._timing = timing
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{key}"
+        self._attr_native_value: float | None = None
+        self._attr_extra_state_attributes = {}
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Read the latest timing; the cumulative counters are in diagnostics."""
+        source = self.coordinator if self._source == "coordinator" else getattr(self.coordinator, self._source)
+        timing = source.stats.timings.get(self._timing)
+        if timing is None:
+            value, attributes = None, {}
+        else:
+            attributes = timing.as_dict()
+            value = attributes.pop("last_ms")
+
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
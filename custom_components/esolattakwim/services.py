@@ -0,0 +1,169 @@
+"""Services for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END_DATE,
+    ATTR_FORCE,
+    ATTR_HIJRI_YEAR,
+    ATTR_START_DATE,
+    ATTR_ZONE,
+    ATTR_ZONES,
+    DOMAIN,
+    IMSAKIYAH_OFFSETS,
+    MAX_QUERY_DAYS,
+    SERVICE_COMPARE_OFFLINE,
+    SERVICE_GET_IMSAKIYAH,
+    SERVICE_GET_PRAYER_TIMES,
+    SERVICE_PREFETCH_ZONES,
+    SERVICE_REFRESH,
+    ZONES,
+)
+from .coordinator import EsolatCoordinator
+from .prayer_times import PrayerTimesData
+from .zone_registry import async_get_zone_registry
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+PREFETCH_ZONES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ZONES): vol.All(cv.ensure_list, [vol.All(cv.string, vol.Lower, vol.In(ZONES))]),
+    vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+})
+
+GET_IMSAKIYAH_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_HIJRI_YEAR): vol.All(vol.Coerce(int), vol.Range(min=1400, max=1600)),
+    **{
+        vol.Optional(option): vol.All(vol.Coerce(int), vol.Range(min=-60, max=60))
+        for option in IMSAKIYAH_OFFSETS.values()
+    },
+})
+
+GET_PRAYER_TIMES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_START_DATE): cv.date,
+    vol.Optional(ATTR_END_DATE): cv.date,
+    vol.Exclusive(ATTR_CONFIG_ENTRY_ID, "target"): cv.string,
+    vol.Exclusive(ATTR_ZONE, "target"): vol.All(cv.string, vol.Lower, vol.In(ZONES)),
+})
+
+
+def _get_coordinators(hass: HomeAssistant, call: ServiceCall) -> list[EsolatCoordinator]:
+    """Return the coordinators targeted by a service call."""
+    coordinators: dict[str, EsolatCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is None:
+        return list(coordinators.values())
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+    return [coordinators[entry_id]]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_handle_refresh(call: ServiceCall) -> None:
+        """Force a takwim download for the targeted entries."""
+        for coordinator in _get_coordinators(hass, call):
+            _LOGGER.debug("Forcing prayer times refresh for zone %s", coordinator.zone)
+            await coordinator.async_force_refresh()
+
+    async def async_handle_prefetch_zones(call: ServiceCall) -> ServiceResponse:
+        """Download the takwim of several zones into their storage."""
+        results = await async_get_zone_registry(hass).async_prefetch(
+            call.data[ATTR_ZONES],
+            async_get_clientsession(hass),
+            force=call.data[ATTR_FORCE],
+        )
+        return {"zones": results}
+
+    async def async_handle_compare_offline(call: ServiceCall) -> ServiceResponse:
+        """Compare the offline calculator against the published takwim."""
+        return {
+            coordinator.config_entry.entry_id: coordinator.prayer_times.compare_with_offline()
+            for coordinator in _get_coordinators(hass, call)
+        }
+
+    async def async_handle_get_imsakiyah(call: ServiceCall) -> ServiceResponse:
+        """Build the Ramadhan imsakiyah timetable of the targeted entries."""
+        response = {}
+        for coordinator in _get_coordinators(hass, call):
+            # Offsets given in the call override the entry's configured ones
+            configured = coordinator.imsakiyah_offsets
+            offsets = {
+                prayer: call.data.get(option, configured[prayer])
+                for prayer, option in IMSAKIYAH_OFFSETS.items()
+            }
+            response[coordinator.config_entry.entry_id] = coordinator.prayer_times.get_imsakiyah(
+                call.data.get(ATTR_HIJRI_YEAR), offsets
+            )
+        return response
+
+    async def async_handle_get_prayer_times(call: ServiceCall) -> ServiceResponse:
+        """Return compact per-day prayer time rows for a date range."""
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE, start)
+        if end < start:
+            raise ServiceValidationError("end_date must not be before start_date")
+        if (end - start).days >= MAX_QUERY_DAYS:
+            raise ServiceValidationError(f"Date range is limited to {MAX_QUERY_DAYS} days")
+
+        if (zone := call.data.get(ATTR_ZONE)) is not None:
+            registry = async_get_zone_registry(hass)
+            data = registry.get(zone)
+            if data is None:
+                # Zone not used by any entry, answer from its stored takwim
+                data = PrayerTimesData(zone, hass)
+                await data.load_cached_data()
+            else:
+                await registry.async_load(zone)
+            sources = [data]
+        else:
+            sources = list({
+                coordinator.zone: coordinator.prayer_times
+                for coordinator in _get_coordinators(hass, call)
+            }.values())
+
+        return {"zones": {data.zone: data.get_rows(start, end) for data in sources}}
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_handle_refresh, schema=REFRESH_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PREFETCH_ZONES,
+        async_handle_prefetch_zones,
+        schema=PREFETCH_ZONES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPARE_OFFLINE,
+        async_handle_compare_offline,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_IMSAKIYAH,
+        async_handle_get_imsakiyah,
+        schema=GET_IMSAKIYAH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PRAYER_TIMES,
+        async_handle_get_prayer_times,
+        schema=GET_PRAYER_TIMES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
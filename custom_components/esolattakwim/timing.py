@@ -0,0 +1,70 @@
+"""Lightweight timing counters for eSolat Takwim Malaysia diagnostics."""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+
+@dataclass(slots=True)
+class Timing:
+    """Call count, last and cumulative duration of one measured path."""
+
+    count: int = 0
+    last: float = 0.0
+    total: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing in milliseconds."""
+        return {
+            "count": self.count,
+            "last_ms": round(self.last * 1000, 3),
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+        }
+
+
+class TimingStats:
+    """Durations, cumulative counters and last values of the measured paths."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.timings: dict[str, Timing] = {}
+        self.counters: Counter[str] = Counter()
+        self.gauges: dict[str, Any] = {}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time the enclosed block, recording it even if it raises."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one duration."""
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+        timing.count += 1
+        timing.last = seconds
+        timing.total += seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a cumulative counter."""
+        self.counters[name] += value
+
+    def set(self, name: str, value: Any) -> None:
+        """Set the last observed value of a gauge."""
+        self.gauges[name] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all statistics for diagnostics."""
+        return {
+            "timings": {name: timing.as_dict() for name, timing in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": dict(sorted(self.gauges.items())),
+        }
@@ -0,0 +1,128 @@
+"""Per-zone registry of shared prayer times data for eSolat Takwim Malaysia."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from datetime import timedelta
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_ZONE_REGISTRY, DEFAULT_REFRESH_INTERVAL, PREFETCH_CONCURRENCY
+from .islamic_events import IslamicEventsData
+from .prayer_times import PrayerTimesData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ZoneRegistry:
+    """Share one PrayerTimesData per zone and deduplicate its loads and fetches."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self.hass = hass
+        self.islamic_events = IslamicEventsData(hass)
+        self._zones: dict[str, PrayerTimesData] = {}
+        self._refs: Counter[str] = Counter()
+        self._loads: dict[str, asyncio.Task[None]] = {}
+        self._fetches: dict[str, asyncio.Task[bool]] = {}
+        self._events_load: asyncio.Task[None] | None = None
+        self._events_fetch: asyncio.Task[bool] | None = None
+
+    def acquire(self, zone: str) -> PrayerTimesData:
+        """Return the shared prayer times of a zone and take a reference to it."""
+        if zone not in self._zones:
+            self._zones[zone] = PrayerTimesData(zone, self.hass)
+        self._refs[zone] += 1
+        return self._zones[zone]
+
+    def release(self, zone: str) -> None:
+        """Drop a reference, forgetting the zone once nothing uses it."""
+        self._refs[zone] -= 1
+        if self._refs[zone] <= 0:
+            del self._refs[zone]
+            self._zones.pop(zone, None)
+            self._loads.pop(zone, None)
+
+    def get(self, zone: str) -> PrayerTimesData | None:
+        """Return the prayer times of a zone if some entry uses it."""
+        return self._zones.get(zone)
+
+    async def async_load(self, zone: str) -> None:
+        """Load a zone's cache from storage once, however many entries share it."""
+        if zone not in self._loads:
+            self._loads[zone] = self.hass.async_create_task(self._zones[zone].load_cached_data())
+        await self._loads[zone]
+
+    async def async_fetch(
+        self, zone: str, session: aiohttp.ClientSession, force: bool = False
+    ) -> bool:
+        """Fetch a zone's takwim, joining a fetch already in flight for that zone."""
+        task = self._fetches.get(zone)
+        if task is None:
+            task = self.hass.async_create_task(self._zones[zone].fetch_prayer_times(session, force))
+            self._fetches[zone] = task
+            task.add_done_callback(lambda _: self._fetches.pop(zone, None))
+        return await asyncio.shield(task)
+
+    async def async_prefetch(
+        self,
+        zones: Iterable[str],
+        session: aiohttp.ClientSession,
+        limit: int = PREFETCH_CONCURRENCY,
+        force: bool = False,
+    ) -> dict[str, bool]:
+        """Warm the storage of several zones, downloading at most `limit` at once.
+
+        Zones with a complete, fresh cache are skipped unless `force` is set.
+        Each zone is held in the registry while it is prefetched, so an entry
+        setting it up meanwhile shares the same data and joins the fetch.
+        Returns whether usable data is available for each zone.
+        """
+        semaphore = asyncio.Semaphore(limit)
+        refresh_interval = timedelta(hours=DEFAULT_REFRESH_INTERVAL)
+
+        async def _prefetch(zone: str) -> bool:
+            async with semaphore:
+                data = self.acquire(zone)
+                try:
+                    await self.async_load(zone)
+                    if not force and not data.needs_refresh(refresh_interval):
+                        _LOGGER.debug("Prayer times for zone %s already cached", zone)
+                        return True
+                    return await self.async_fetch(zone, session, force)
+                finally:
+                    self.release(zone)
+
+        zones = sorted(set(zones))
+        results = await asyncio.gather(*(_prefetch(zone) for zone in zones))
+        return dict(zip(zones, results))
+
+    async def async_load_events(self) -> None:
+        """Load the cached Islamic events once."""
+        if self._events_load is None:
+            self._events_load = self.hass.async_create_task(self.islamic_events.load_cached_data())
+        await self._events_load
+
+    async def async_fetch_events(self, session: aiohttp.ClientSession) -> bool:
+        """Fetch the Islamic events feed, joining a fetch already in flight."""
+        if self._events_fetch is None:
+            self._events_fetch = self.hass.async_create_task(
+                self.islamic_events.fetch_islamic_events(session)
+            )
+
+            def _done(_: asyncio.Task[bool]) -> None:
+                self._events_fetch = None
+
+            self._events_fetch.add_done_callback(_done)
+        return await asyncio.shield(self._events_fetch)
+
+
+def async_get_zone_registry(hass: HomeAssistant) -> ZoneRegistry:
+    """Return the zone registry, creating it on first use."""
+    if DATA_ZONE_REGISTRY not in hass.data:
+        hass.data[DATA_ZONE_REGISTRY] = ZoneRegistry(hass)
+    return hass.data[DATA_ZONE_REGISTRY]
@@ -0,0 +1,147 @@
+"""Fixtures for the eSolat Takwim Malaysia tests.
+
+The API bodies in fixtures/ are synthetic: generate_fixtures.py builds them
+with the shape and size of real responses from the offline calculator and
+the tabular Hijri calendar, so they carry no JAKIM data.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.esolattakwim import islamic_events, prayer_times
+from custom_components.esolattakwim.const import CONF_FEED_TOKEN, DOMAIN
+from custom_components.esolattakwim.coordinator import EsolatCoordinator
+from custom_components.esolattakwim.prayer_times import DATE_FORMAT
+
+FIXTURES = Path(__file__).parent / "fixtures"
+TAKWIM_FIXTURE = "synthetic_takwimsolat_sgr01_2026_2027.json"
+TAKWIM_YEARS = (2026, 2027)
+EVENTS_FIXTURE = "synthetic_islamicevent.json"
+FIXTURE_NOW = "2026-10-18T09:00:00+08:00"
+DECEMBER_NOW = "2026-12-15T09:00:00+08:00"  # next year is fetched too
+
+
+def load_fixture(name: str) -> bytes:
+    """Return the body of a synthetic API response."""
+    return (FIXTURES / name).read_bytes()
+
+
+def assert_median_below(benchmark: Any, seconds: float) -> None:
+    """Fail if the benchmarked median exceeds a threshold."""
+    if benchmark.stats is None:
+        # Benchmarks disabled (--benchmark-disable), the call ran once untimed
+        return
+    median = benchmark.stats.stats.median
+    assert median < seconds, f"median {median * 1000:.2f} ms exceeds {seconds * 1000:.2f} ms"
+
+
+async def async_benchmark(
+    hass: HomeAssistant, benchmark: Any, func: Callable[[], Awaitable[Any]]
+) -> None:
+    """Benchmark a coroutine function on the event loop.
+
+    pytest-benchmark only times plain callables, so the timer runs in an
+    executor thread and schedules each round on the loop.
+    """
+
+    def _run() -> None:
+        asyncio.run_coroutine_threadsafe(func(), hass.loop).result()
+
+    await hass.async_add_executor_job(benchmark, _run)
+
+
+@pytest.fixture
+def takwim_body() -> bytes:
+    """Return the synthetic takwimsolat response for SGR01, 2026 and 2027."""
+    return load_fixture(TAKWIM_FIXTURE)
+
+
+@pytest.fixture
+def events_body() -> bytes:
+    """Return the synthetic islamicevent response."""
+    return load_fixture(EVENTS_FIXTURE)
+
+
+@pytest.fixture
+def fixture_now(freezer: Any) -> datetime:
+    """Freeze time in October of the first takwim year."""
+    freezer.move_to(FIXTURE_NOW)
+    return datetime.fromisoformat(FIXTURE_NOW)
+
+
+@pytest.fixture
+async def esolat_server(
+    socket_enabled: None,
+    aiohttp_server: Any,
+    monkeypatch: pytest.MonkeyPatch,
+    takwim_body: bytes,
+    events_body: bytes,
+) -> Any:
+    """Serve the synthetic responses the way the eSolat API does, and point the integration at it."""
+    rows = json.loads(takwim_body)
+    days = {
+        datetime.strptime(row["date"], DATE_FORMAT).date(): row for row in rows["prayerTime"]
+    }
+    etag = f'"{hashlib.sha256(events_body).hexdigest()[:16]}"'
+
+    async def takwimsolat(request: web.Request) -> web.Response:
+        form = await request.post()
+        start = datetime.strptime(form["datestart"], "%Y-%m-%d").date()
+        end = datetime.strptime(form["dateend"], "%Y-%m-%d").date()
+        body = {**rows, "prayerTime": [row for day, row in days.items() if start <= day <= end]}
+        return web.Response(body=json.dumps(body, separators=(",", ":")), content_type="text/html")
+
+    async def islamicevent(request: web.Request) -> web.Response:
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=events_body, content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_post("/takwimsolat", takwimsolat)
+    app.router.add_get("/islamicevent", islamicevent)
+    server = await aiohttp_server(app)
+    monkeypatch.setattr(prayer_times, "PRAYER_TIMES_API", str(server.make_url("/takwimsolat")) + "?zone={zone}")
+    monkeypatch.setattr(islamic_events, "ISLAMIC_EVENTS_API", str(server.make_url("/islamicevent")))
+    return server
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Return a client session for the test server."""
+    async with aiohttp.ClientSession() as client:
+        yield client
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+    fixture_now: datetime,
+    esolat_server: Any,
+    session: aiohttp.ClientSession,
+) -> AsyncIterator[EsolatCoordinator]:
+    """Return a coordinator for SGR01 holding the synthetic takwim and events."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="eSolat Takwim Malaysia (SGR01)",
+        data={"zone": "sgr01", CONF_FEED_TOKEN: "feed-token"},
+    )
+    entry.add_to_hass(hass)
+    coordinator = EsolatCoordinator(hass, entry)
+    assert await coordinator.prayer_times.fetch_prayer_times(session, force=True)
+    assert await coordinator.islamic_events_data.fetch_islamic_events(session)
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,117 @@
+"""Generate the synthetic eSolat API responses used as test fixtures.
+
+The bodies have the shape and size of real takwimsolat and islamicevent
+responses, but the prayer times come from the offline calculator and the
+Hijri dates from the tabular calendar, so they are not JAKIM's data. Run
+from the repository root:
+
+    python -m tests.generate_fixtures
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+import json
+from math import ceil, floor
+
+from custom_components.esolattakwim.astronomy import compute_prayer_times
+from custom_components.esolattakwim.const import HIJRI_MONTHS, ZONE_COORDINATES
+
+from .conftest import EVENTS_FIXTURE, FIXTURES, TAKWIM_FIXTURE, TAKWIM_YEARS
+
+ZONE = "sgr01"
+# Tabular Islamic calendar epoch (1 Muharram 1 AH) as a Julian day
+_HIJRI_EPOCH = 1948439.5
+_JD_ORDINAL_OFFSET = 1721424.5
+EVENTS = [
+    ("Awal Muharram", 1, 1),
+    ("Hari Asyura", 1, 10),
+    ("Maulidur Rasul", 3, 12),
+    ("Israk dan Mikraj", 7, 27),
+    ("Nisfu Syaaban", 8, 15),
+    ("Awal Ramadhan", 9, 1),
+    ("Nuzul Al-Quran", 9, 17),
+    ("Hari Raya Aidilfitri", 10, 1),
+    ("Hari Arafah", 12, 9),
+    ("Hari Raya Aidiladha", 12, 10),
+]
+
+
+def _hijri_to_jd(year: int, month: int, day: int) -> float:
+    """Return the Julian day of a tabular Hijri date."""
+    return (
+        day + ceil(29.5 * (month - 1)) + (year - 1) * 354
+        + floor((3 + 11 * year) / 30) + _HIJRI_EPOCH - 1
+    )
+
+
+def to_hijri(day: date) -> tuple[int, int, int]:
+    """Convert a Gregorian date to the tabular Hijri calendar."""
+    jd = day.toordinal() + _JD_ORDINAL_OFFSET
+    year = floor((30 * (jd - _HIJRI_EPOCH) + 10646) / 10631)
+    month = min(12, ceil((jd - (29 + _hijri_to_jd(year, 1, 1))) / 29.5) + 1)
+    return year, month, int(jd - _hijri_to_jd(year, month, 1) + 1)
+
+
+def to_gregorian(year: int, month: int, day: int) -> date:
+    """Convert a tabular Hijri date to the Gregorian calendar."""
+    return date.fromordinal(int(_hijri_to_jd(year, month, day) - _JD_ORDINAL_OFFSET))
+
+
+def takwim() -> dict:
+    """Build a takwimsolat response covering TAKWIM_YEARS."""
+    first, last = date(TAKWIM_YEARS[0], 1, 1), date(TAKWIM_YEARS[-1], 12, 31)
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    rows = []
+    for day, times in zip(days, compute_prayer_times(*ZONE_COORDINATES[ZONE], days)):
+        year, month, hijri_day = to_hijri(day)
+        rows.append({
+            "hijri": f"{year}-{month:02d}-{hijri_day:02d}",
+            "date": day.strftime("%d-%b-%Y"),
+            "day": day.strftime("%A"),
+            "imsak": times["imsak"].strftime("%H:%M:%S"),
+            "fajr": times["fajr"].strftime("%H:%M:%S"),
+            "syuruk": times["syuruk"].strftime("%H:%M:%S"),
+            "dhuha": (times["syuruk"] + timedelta(minutes=28)).strftime("%H:%M:%S"),
+            "dhuhr": times["dhuhr"].strftime("%H:%M:%S"),
+            "asr": times["asr"].strftime("%H:%M:%S"),
+            "maghrib": times["maghrib"].strftime("%H:%M:%S"),
+            "isha": times["isha"].strftime("%H:%M:%S"),
+        })
+    return {
+        "prayerTime": rows,
+        "status": "OK!",
+        "serverTime": f"{first:%Y-%m-%d} 00:00:00",
+        "periodType": "duration",
+        "lang": "ms_my",
+        "zone": ZONE.upper(),
+        "bearing": "292&#176; 34&#8242; 52&#8243;",
+    }
+
+
+def islamic_events() -> dict:
+    """Build an islamicevent response for every Hijri year overlapping TAKWIM_YEARS."""
+    first_year = to_hijri(date(TAKWIM_YEARS[0], 1, 1))[0]
+    last_year = to_hijri(date(TAKWIM_YEARS[-1], 12, 31))[0]
+    events = [
+        {
+            "hari_peristiwa": name,
+            "tarikh_miladi": to_gregorian(year, month, day).isoformat(),
+            "tarikh_hijri": f"{year}-{month:02d}-{day:02d}",
+            "tarikh_desc": f"{day} {HIJRI_MONTHS[f'{month:02d}']} {year}H",
+        }
+        for year in range(first_year, last_year + 1)
+        for name, month, day in EVENTS
+    ]
+    events.sort(key=lambda event: event["tarikh_miladi"])
+    return {"event": events, "status": "OK!"}
+
+
+def main() -> None:
+    """Write the synthetic takwim and Islamic events bodies."""
+    FIXTURES.mkdir(exist_ok=True)
+    for name, body in ((TAKWIM_FIXTURE, takwim()), (EVENTS_FIXTURE, islamic_events())):
+        (FIXTURES / name).write_text(json.dumps(body, separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Performance regression gates for the eSolat Takwim Malaysia hot paths.
+
+Run with `pytest tests --benchmark-only` to see the timings. Thresholds are
+several times the typical median so they catch regressions in complexity,
+not machine noise.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import json
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.esolattakwim.api import STREAM_CHUNK_SIZE, JsonArrayStreamParser
+from custom_components.esolattakwim.calendar import EsolatCalendar
+from custom_components.esolattakwim.coordinator import EsolatCoordinator
+from custom_components.esolattakwim.islamic_events import IslamicEventsData
+from custom_components.esolattakwim.prayer_times import PrayerTimesData, parse_prayer_day
+
+from .conftest import (
+    DECEMBER_NOW,
+    FIXTURE_NOW,
+    TAKWIM_YEARS,
+    assert_median_below,
+    async_benchmark,
+)
+
+TAKWIM_DAYS = (date(TAKWIM_YEARS[-1], 12, 31) - date(TAKWIM_YEARS[0], 1, 1)).days + 1
+
+
+def _stream(body: bytes) -> list[Any]:
+    """Stream-parse a takwim body into PrayerDays the way the fetch does."""
+    days: list[Any] = []
+    parser = JsonArrayStreamParser("prayerTime", lambda row: days.append(parse_prayer_day(row["date"], row)))
+    for offset in range(0, len(body), STREAM_CHUNK_SIZE):
+        parser.feed(body[offset:offset + STREAM_CHUNK_SIZE])
+    parser.feed(b"", final=True)
+    return days
+
+
+def _load_takwim(hass: HomeAssistant, body: bytes) -> PrayerTimesData:
+    """Return SGR01 prayer times holding every day of a takwim body."""
+    data = PrayerTimesData("sgr01", hass)
+    for row in json.loads(body)["prayerTime"]:
+        data._add_day(parse_prayer_day(row["date"], row))
+    data._rebuild_indexes()
+    return data
+
+
+def test_stream_parse_takwim(benchmark: Any, takwim_body: bytes) -> None:
+    """Stream-parsing two years of takwim stays fast."""
+    days = benchmark(_stream, takwim_body)
+    assert len(days) == TAKWIM_DAYS
+    assert days == [parse_prayer_day(row["date"], row) for row in json.loads(takwim_body)["prayerTime"]]
+    assert_median_below(benchmark, 0.2)
+
+
+async def test_fetch_prayer_times(
+    hass: HomeAssistant,
+    benchmark: Any,
+    fixture_now: datetime,
+    esolat_server: Any,
+    session: aiohttp.ClientSession,
+) -> None:
+    """A forced fetch of the year over HTTP, including the store save, stays fast."""
+    data = PrayerTimesData("sgr01", hass)
+
+    async def _fetch() -> None:
+        data._saved_content = None  # write on every round
+        assert await data.fetch_prayer_times(session, force=True)
+
+    await async_benchmark(hass, benchmark, _fetch)
+    diagnostics = data.diagnostics()
+    assert diagnostics["days"] == 365
+    assert diagnostics["estimated_days"] == 0
+    assert_median_below(benchmark, 0.5)
+
+
+async def test_fetch_prayer_times_december(
+    hass: HomeAssistant,
+    benchmark: Any,
+    freezer: Any,
+    esolat_server: Any,
+    session: aiohttp.ClientSession,
+) -> None:
+    """In December the forced fetch downloads this year and the next, and stays fast."""
+    freezer.move_to(DECEMBER_NOW)
+    data = PrayerTimesData("sgr01", hass)
+
+    async def _fetch() -> None:
+        data._saved_content = None
+        assert await data.fetch_prayer_times(session, force=True)
+
+    await async_benchmark(hass, benchmark, _fetch)
+    diagnostics = data.diagnostics()
+    assert diagnostics["days"] == TAKWIM_DAYS
+    assert diagnostics["estimated_days"] == 0
+    assert (diagnostics["first_day"], diagnostics["last_day"]) == ("2026-01-01", "2027-12-31")
+    assert_median_below(benchmark, 1.0)
+
+
+async def test_store_roundtrip(hass: HomeAssistant, benchmark: Any, takwim_body: bytes) -> None:
+    """Saving two years to the store and loading them back stays fast."""
+    data = _load_takwim(hass, takwim_body)
+
+    async def _roundtrip() -> None:
+        data._saved_content = None
+        await data.save_data()
+        restored = PrayerTimesData("sgr01", hass)
+        await restored.load_cached_data()
+        assert restored.diagnostics()["days"] == TAKWIM_DAYS
+
+    await async_benchmark(hass, benchmark, _roundtrip)
+    assert_median_below(benchmark, 0.3)
+
+
+async def test_get_events(hass: HomeAssistant, benchmark: Any, takwim_body: bytes) -> None:
+    """Building a cold month of calendar events stays fast."""
+    data = _load_takwim(hass, takwim_body)
+    start = datetime.fromisoformat(FIXTURE_NOW)
+    rounds = iter(range(1_000_000))
+
+    def _month() -> list[Any]:
+        # Shift the window every round so the event cache never answers
+        shifted = start + timedelta(minutes=next(rounds))
+        return data.get_events(shifted, shifted + timedelta(days=31))
+
+    events = benchmark(_month)
+    assert len(events) >= 31 * 7
+    assert_median_below(benchmark, 0.1)
+
+
+async def test_get_events_day(hass: HomeAssistant, benchmark: Any, takwim_body: bytes) -> None:
+    """A cold one-day window, as the calendar card's day view asks, only touches its days."""
+    data = _load_takwim(hass, takwim_body)
+    start = datetime.fromisoformat(FIXTURE_NOW)
+    rounds = iter(range(1_000_000))
+
+    def _day() -> list[Any]:
+        shifted = start + timedelta(seconds=next(rounds))
+        return data.get_events(shifted, shifted + timedelta(days=1))
+
+    events = benchmark(_day)
+    assert 7 <= len(events) <= 9
+    assert_median_below(benchmark, 0.005)
+
+
+async def test_calendar_event(benchmark: Any, coordinator: EsolatCoordinator) -> None:
+    """Finding the calendar's next event after a data change stays fast."""
+    calendar = EsolatCalendar(coordinator)
+
+    def _next_event() -> Any:
+        calendar._next_event_version = None  # as if the data had just changed
+        return calendar.event
+
+    event = benchmark(_next_event)
+    assert event is not None
+    assert event.start >= datetime.fromisoformat(FIXTURE_NOW)
+    assert_median_below(benchmark, 0.005)
+
+
+async def test_get_current_and_next_prayer(benchmark: Any, coordinator: EsolatCoordinator) -> None:
+    """Looking up the current and next prayer stays fast."""
+    current, upcoming, upcoming_time = benchmark(coordinator.prayer_times.get_current_and_next_prayer)
+    assert current is not None
+    assert upcoming is not None
+    assert upcoming_time is not None
+    assert_median_below(benchmark, 0.001)
+
+
+async def test_get_prayer_times_utc(benchmark: Any, coordinator: EsolatCoordinator) -> None:
+    """Formatting today's prayer times in UTC stays fast."""
+    utc_times = benchmark(coordinator.prayer_times.get_prayer_times_utc)
+    assert set(utc_times) >= {"fajr", "dhuhr", "asr", "maghrib", "isha"}
+    assert_median_below(benchmark, 0.002)
+
+
+async def test_fetch_islamic_events(
+    hass: HomeAssistant,
+    benchmark: Any,
+    fixture_now: datetime,
+    esolat_server: Any,
+    session: aiohttp.ClientSession,
+) -> None:
+    """Downloading the events feed, and then revalidating it, stays fast."""
+    data = IslamicEventsData(hass)
+    assert await data.fetch_islamic_events(session)
+    assert data.index.next_after(fixture_now) is not None
+
+    async def _revalidate() -> None:
+        assert not await data.fetch_islamic_events(session)
+
+    await async_benchmark(hass, benchmark, _revalidate)
+    assert data.diagnostics()["counters"]["not_modified"] >= 1
+    assert_median_below(benchmark, 0.05)
+    assert date.fromisoformat(data.diagnostics()["last_fetch"][:10]) == fixture_now.date()